@@ -0,0 +1,124 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 10:00:00
+
+Tables as the app used to create them on startup with create_all. Each
+table is only created if missing, so databases bootstrapped that way can
+simply be upgraded.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+friendship_status = postgresql.ENUM('PENDING', 'ACCEPTED', 'REJECTED', name='friendshipstatus', create_type=False)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table('users'):
+        op.create_table(
+            'users',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('password_hash', sa.String(), nullable=True),
+            sa.Column('full_name', sa.String(), nullable=True),
+            sa.Column('provider', sa.String(), nullable=True),
+            sa.Column('provider_id', sa.String(), nullable=True),
+            sa.Column('avatar_url', sa.String(), nullable=True),
+            sa.Column('bio', sa.Text(), nullable=True),
+            sa.Column('birthday', sa.Date(), nullable=True),
+            sa.Column('location', sa.String(), nullable=True),
+            sa.Column('phone', sa.String(), nullable=True),
+            sa.Column('website', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if not inspector.has_table('wishlists'):
+        op.create_table(
+            'wishlists',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('slug', sa.String(), nullable=False),
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.Column('owner_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index('ix_wishlists_slug', 'wishlists', ['slug'], unique=True)
+        op.create_index('ix_wishlists_owner_id', 'wishlists', ['owner_id'])
+
+    if not inspector.has_table('items'):
+        op.create_table(
+            'items',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('wishlist_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('wishlists.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('url', sa.String(), nullable=True),
+            sa.Column('price', sa.Numeric(10, 2), nullable=False),
+            sa.Column('image_url', sa.String(), nullable=True),
+            sa.Column('is_group_gift', sa.Boolean(), nullable=False),
+            sa.Column('created_by', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index('ix_items_wishlist_id', 'items', ['wishlist_id'])
+
+    if not inspector.has_table('reservations'):
+        op.create_table(
+            'reservations',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('item_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('items.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+            sa.Column('guest_name', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+        op.create_index('ix_reservations_item_id', 'reservations', ['item_id'], unique=True)
+
+    if not inspector.has_table('contributions'):
+        op.create_table(
+            'contributions',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('item_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('items.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+            sa.Column('guest_name', sa.String(), nullable=True),
+            sa.Column('amount', sa.Numeric(10, 2), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+        op.create_index('ix_contributions_item_id', 'contributions', ['item_id'])
+        op.create_index('idx_item_id_created_at', 'contributions', ['item_id', 'created_at'])
+
+    if not inspector.has_table('friendships'):
+        friendship_status.create(bind, checkfirst=True)
+        op.create_table(
+            'friendships',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('requester_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('addressee_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('status', friendship_status, nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('friendships')
+    friendship_status.drop(op.get_bind(), checkfirst=True)
+    op.drop_table('contributions')
+    op.drop_table('reservations')
+    op.drop_table('items')
+    op.drop_table('wishlists')
+    op.drop_table('users')
@@ -0,0 +1,35 @@
+"""user profile fields
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 10:01:00
+
+Same as migrations/add_user_profile_fields.sql, which used to run on every
+startup.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS bio TEXT,
+        ADD COLUMN IF NOT EXISTS birthday DATE,
+        ADD COLUMN IF NOT EXISTS location VARCHAR(255),
+        ADD COLUMN IF NOT EXISTS phone VARCHAR(50),
+        ADD COLUMN IF NOT EXISTS website VARCHAR(255),
+        ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE
+    """)
+    op.execute("UPDATE users SET updated_at = created_at WHERE updated_at IS NULL")
+
+
+def downgrade() -> None:
+    # Profile fields are part of the initial schema for new databases
+    pass
@@ -0,0 +1,41 @@
+"""item funding totals
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 10:02:00
+
+Running funded_amount and contribution_count on items, backfilled from
+contributions. Same as migrations/add_item_funding_totals.sql.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE items
+        ADD COLUMN IF NOT EXISTS funded_amount NUMERIC(10, 2) NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS contribution_count INTEGER NOT NULL DEFAULT 0
+    """)
+    op.execute("""
+        UPDATE items
+        SET funded_amount = totals.total,
+            contribution_count = totals.cnt
+        FROM (
+            SELECT item_id, SUM(amount) AS total, COUNT(*) AS cnt
+            FROM contributions
+            GROUP BY item_id
+        ) AS totals
+        WHERE items.id = totals.item_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('items', 'contribution_count')
+    op.drop_column('items', 'funded_amount')
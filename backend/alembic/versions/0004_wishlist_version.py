@@ -0,0 +1,25 @@
+"""wishlist version
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 10:03:00
+
+Version counter behind ETags and the rendered wishlist cache. Same as
+migrations/add_wishlist_version.sql.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE wishlists ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1")
+
+
+def downgrade() -> None:
+    op.drop_column('wishlists', 'version')
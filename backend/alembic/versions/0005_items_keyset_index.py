@@ -0,0 +1,30 @@
+"""items keyset index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 10:04:00
+
+Composite index for keyset pagination of wishlist items, built without
+blocking writes. Same as migrations/add_items_keyset_index.sql.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_items_wishlist_created_at_id
+            ON items (wishlist_id, created_at DESC, id DESC)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_items_wishlist_created_at_id")
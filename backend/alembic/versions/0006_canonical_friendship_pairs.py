@@ -0,0 +1,64 @@
+"""canonical friendship pairs
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 10:05:00
+
+Both directions of a friendship share one row keyed by (user_low,
+user_high); duplicates are removed keeping accepted over pending over
+rejected, then the most recently updated. Same as
+migrations/canonical_friendship_pairs.sql.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE friendships
+        ADD COLUMN IF NOT EXISTS user_low UUID,
+        ADD COLUMN IF NOT EXISTS user_high UUID
+    """)
+    op.execute("""
+        UPDATE friendships
+        SET user_low = LEAST(requester_id, addressee_id),
+            user_high = GREATEST(requester_id, addressee_id)
+        WHERE user_low IS NULL OR user_high IS NULL
+    """)
+    op.execute("""
+        DELETE FROM friendships f
+        USING (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY user_low, user_high
+                       ORDER BY CASE status WHEN 'ACCEPTED' THEN 0 WHEN 'PENDING' THEN 1 ELSE 2 END,
+                                updated_at DESC
+                   ) AS rn
+            FROM friendships
+        ) ranked
+        WHERE f.id = ranked.id AND ranked.rn > 1
+    """)
+    op.execute("""
+        ALTER TABLE friendships
+        ALTER COLUMN user_low SET NOT NULL,
+        ALTER COLUMN user_high SET NOT NULL
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_friendships_pair ON friendships (user_low, user_high) INCLUDE (status)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_friendships_user_high_status ON friendships (user_high, status)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_friendships_requester_status ON friendships (requester_id, status)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_friendships_addressee_status ON friendships (addressee_id, status)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_friendships_addressee_status")
+    op.execute("DROP INDEX IF EXISTS idx_friendships_requester_status")
+    op.execute("DROP INDEX IF EXISTS idx_friendships_user_high_status")
+    op.execute("DROP INDEX IF EXISTS uq_friendships_pair")
+    op.drop_column('friendships', 'user_high')
+    op.drop_column('friendships', 'user_low')
@@ -0,0 +1,41 @@
+"""user search indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 10:06:00
+
+pg_trgm indexes for user search plus the lower(email) prefix index, built
+without blocking writes. Same as migrations/add_user_search_indexes.sql.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower_prefix
+            ON users (lower(email) text_pattern_ops)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower_trgm
+            ON users USING gin (lower(email) gin_trgm_ops)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_full_name_trgm
+            ON users USING gin (full_name gin_trgm_ops)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_full_name_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_email_lower_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_email_lower_prefix")
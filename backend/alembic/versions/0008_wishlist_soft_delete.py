@@ -0,0 +1,33 @@
+"""wishlist soft delete
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 11:00:00
+
+deleted_at marks large wishlists whose rows are still being purged in the
+background. The partial index lets the purge sweep find them without
+scanning live wishlists.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE wishlists ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE")
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wishlists_deleted_at
+            ON wishlists (deleted_at) WHERE deleted_at IS NOT NULL
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_wishlists_deleted_at")
+    op.drop_column('wishlists', 'deleted_at')
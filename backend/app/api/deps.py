@@ -1,20 +1,65 @@
 from typing import Optional
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.db.session import get_db
+from sqlalchemy import select, event
+from sqlalchemy.orm import Session
+from app.db.base import AsyncSessionLocal
 from app.db.models.user import User
+from app.schemas.user import CurrentUser
 from app.core.security import decode_access_token
+from app.core.cache import principal_cache
 
 security = HTTPBearer()
 
 
+# Cached principals are dropped after the commit that changes their User row,
+# not at flush: a request that re-caches the row in between would otherwise
+# put the old values back. Sessions cover ORM changes and update(User) /
+# delete(User) run through them; a Core statement on a plain connection (e.g.
+# in a script) must call principal_cache.pop for the ids it changes.
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    """Remember which User rows this transaction changed or deleted."""
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_user_changes(orm_execute_state):
+    """Note bulk update(User) / delete(User) statements, whose rows are unknown."""
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is User.__mapper__:
+        orm_execute_state.session.info["bulk_user_change"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_cached_principals(session):
+    """Forget the principals whose User rows the committed transaction changed."""
+    if session.info.pop("bulk_user_change", False):
+        principal_cache.clear()
+    for user_id in session.info.pop("changed_user_ids", ()):
+        principal_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
+    session.info.pop("bulk_user_change", None)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get the current authenticated user."""
+) -> CurrentUser:
+    """Get the current authenticated user.
+    
+    The token is verified on every request; the principal behind it comes
+    from principal_cache and the users table is only read on a miss, in a
+    short session of its own so the connection is back in the pool before
+    the handler runs, and a rejected token never holds one.
+    """
     token = credentials.credentials
     payload = decode_access_token(token)
     
@@ -25,15 +70,21 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id: Optional[str] = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = UUID(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
     
     if user is None:
         raise HTTPException(
@@ -41,19 +92,19 @@ async def get_current_user(
             detail="User not found",
         )
     
-    return user
+    principal = CurrentUser.model_validate(user)
+    principal_cache.set(user_id, principal)
+    return principal
 
 
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: AsyncSession = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[CurrentUser]:
     """Get the current user if authenticated, otherwise None."""
     if credentials is None:
         return None
     
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(credentials)
     except HTTPException:
         return None
-
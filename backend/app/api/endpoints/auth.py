@@ -4,8 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.session import get_db
 from app.db.models.user import User
-from app.schemas.user import UserCreate, UserLogin, UserResponse, TokenResponse
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.schemas.user import UserCreate, UserLogin, UserResponse, TokenResponse, CurrentUser
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
 from app.api.deps import get_current_user
 from app.core.config import settings
 from authlib.integrations.starlette_client import OAuth, OAuthError
@@ -50,7 +50,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         
         # Create new user
         print(f"🔐 Creating user: {user_data.email}")
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         new_user = User(
             email=user_data.email,
             password_hash=hashed_password,
@@ -99,7 +99,7 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    if not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password"
@@ -112,7 +112,7 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     """Get current user information."""
     return current_user
 
@@ -18,10 +18,12 @@ class AutofillResponse(BaseModel):
     price: Decimal | None = None
 
 
-@router.post("", response_model=AutofillResponse)
-async def autofill_product(request: AutofillRequest):
-    """Extract product information from a URL."""
-    url = request.url
+async def fetch_product_info(url: str) -> AutofillResponse:
+    """Fetch a product page and extract its title, image and price.
+    
+    Raises HTTPException when the page cannot be fetched; also used by the
+    item import to fill in rows that only have a URL.
+    """
     try:
         async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
             response = await client.get(url, headers={
@@ -45,6 +47,11 @@ async def autofill_product(request: AutofillRequest):
             detail=f"Invalid URL or unable to process: {str(e)}"
         )
     
+    return extract_product_info(html, url)
+
+
+def extract_product_info(html: str, url: str) -> AutofillResponse:
+    """Extract product information from the HTML of a product page."""
     soup = BeautifulSoup(html, "lxml")
     
     # Extract title
@@ -135,3 +142,8 @@ async def autofill_product(request: AutofillRequest):
         price=price
     )
 
+
+@router.post("", response_model=AutofillResponse)
+async def autofill_product(request: AutofillRequest):
+    """Extract product information from a URL."""
+    return await fetch_product_info(request.url)
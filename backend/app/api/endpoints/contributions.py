@@ -1,17 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List
+from sqlalchemy import select, func, tuple_, true
+from typing import List, Optional
+from datetime import datetime
 from uuid import UUID
-from decimal import Decimal
-from app.db.session import get_db
-from app.db.models.user import User
+from app.db.session import get_db, get_read_db
+from app.schemas.user import CurrentUser
 from app.db.models.item import Item
-from app.db.models.contribution import Contribution
 from app.db.models.wishlist import Wishlist
-from app.schemas.contribution import ContributionCreate, ContributionResponse
+from app.db.models.contribution import Contribution
+from app.schemas.contribution import (
+    ContributionCreate, ContributionResponse, ContributionSummaryResponse, ContributorSummary,
+)
 from app.api.deps import get_optional_user
 from app.core.websocket_manager import ws_manager
+from app.core.cache import wishlist_cache
+from app.core.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor
+from app.services.contribution_writer import insert_contribution
+from app.services.wishlist_loader import display_name
 
 router = APIRouter()
 
@@ -20,40 +26,17 @@ router = APIRouter()
 async def contribute_to_item(
     item_id: UUID,
     contribution_data: ContributionCreate,
-    current_user: User | None = Depends(get_optional_user),
+    response: Response,
+    current_user: CurrentUser | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Contribute to a group gift item."""
-    # Get item with lock to prevent concurrent contributions
-    result = await db.execute(
-        select(Item).where(Item.id == item_id).with_for_update()
-    )
-    item = result.scalar_one_or_none()
-    
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Item not found"
-        )
-    
-    # Check if item is a group gift
-    if not item.is_group_gift:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot contribute to a non-group gift item"
-        )
-    
-    # Get current total contributions
-    contrib_result = await db.execute(
-        select(func.coalesce(func.sum(Contribution.amount), 0)).where(
-            Contribution.item_id == item_id
-        )
-    )
-    total_contributions = contrib_result.scalar() or Decimal("0")
-    
-    # Calculate remaining amount
-    remaining = item.price - total_contributions
+    """Contribute to a group gift item.
     
+    The funding check, running totals, insert and version bump happen in one
+    guarded statement without an explicit row lock; only a rejected
+    contribution costs a second query to explain why. The statement's row
+    locks last until the commit that follows it directly.
+    """
     # Validate amount
     if contribution_data.amount <= 0:
         raise HTTPException(
@@ -61,12 +44,6 @@ async def contribute_to_item(
             detail="Contribution amount must be greater than 0"
         )
     
-    if contribution_data.amount > remaining:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Contribution amount exceeds remaining. Only {remaining:.2f} remaining."
-        )
-    
     # Require guest_name if not authenticated
     if not current_user and not contribution_data.guest_name:
         raise HTTPException(
@@ -74,33 +51,56 @@ async def contribute_to_item(
             detail="Guest name is required for unauthenticated users"
         )
     
-    # Create contribution
-    new_contribution = Contribution(
-        item_id=item_id,
+    guest_name = contribution_data.guest_name if not current_user else None
+    created = await insert_contribution(
+        db,
+        item_id,
+        contribution_data.amount,
         user_id=current_user.id if current_user else None,
-        guest_name=contribution_data.guest_name if not current_user else None,
-        amount=contribution_data.amount
+        guest_name=guest_name,
     )
     
-    db.add(new_contribution)
-    await db.commit()
-    await db.refresh(new_contribution)
+    if created is None:
+        await db.rollback()
+        result = await db.execute(
+            select(Item.is_group_gift, Item.price - Item.funded_amount)
+            .join(Wishlist, Wishlist.id == Item.wishlist_id)
+            .where(Item.id == item_id, Wishlist.deleted_at.is_(None))
+        )
+        item = result.one_or_none()
+        
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
+            )
+        
+        is_group_gift, remaining = item
+        if not is_group_gift:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot contribute to a non-group gift item"
+            )
+        
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Contribution amount exceeds remaining. Only {remaining:.2f} remaining."
+        )
     
-    # Get wishlist slug for WebSocket broadcast
-    wishlist_result = await db.execute(select(Wishlist).where(Wishlist.id == item.wishlist_id))
-    wishlist = wishlist_result.scalar_one()
+    await db.commit()
     
-    # Broadcast update immediately
-    await ws_manager.broadcast_wishlist_update(wishlist.slug)
+    # Invalidate cached views and broadcast update immediately
+    wishlist_cache.invalidate(created.slug)
+    await ws_manager.broadcast_wishlist_update(created.slug, created.version)
+    # Lets guests, who are not kept on the primary, read their write back via min_version
+    response.headers["X-Wishlist-Version"] = str(created.version)
     
     # Convert to response format
     contribution_dict = {
-        "id": new_contribution.id,
-        "item_id": new_contribution.item_id,
-        "user_id": new_contribution.user_id,
-        "guest_name": new_contribution.guest_name,
-        "amount": float(new_contribution.amount),
-        "created_at": new_contribution.created_at,
+        "id": created.id,
+        "item_id": item_id,
+        "guest_name": guest_name,
+        "amount": created.amount,
     }
     
     return ContributionResponse(**contribution_dict)
@@ -109,22 +109,116 @@ async def contribute_to_item(
 @router.get("/items/{item_id}/contributions", response_model=List[ContributionResponse])
 async def get_contributions(
     item_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the contributions for an item, oldest first (public endpoint).
+    
+    Pass ``limit`` to page through them; the cursor for the next page is
+    returned in the X-Next-Cursor header and goes back in ``after``. The
+    item is only looked up when the page comes back empty. Items of deleted
+    wishlists are not found.
+    """
+    cursor = decode_cursor(after, datetime.fromisoformat, UUID) if after else None
+    
+    stmt = (
+        select(Contribution)
+        .join(Item, Item.id == Contribution.item_id)
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .where(Contribution.item_id == item_id, Wishlist.deleted_at.is_(None))
+        .order_by(Contribution.created_at, Contribution.id)
+    )
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Contribution.created_at, Contribution.id) > cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    
+    contrib_result = await db.execute(stmt)
+    contributions = contrib_result.scalars().all()
+    
+    if not contributions:
+        item_result = await db.execute(
+            select(Item.id)
+            .join(Wishlist, Wishlist.id == Item.wishlist_id)
+            .where(Item.id == item_id, Wishlist.deleted_at.is_(None))
+        )
+        if item_result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
+            )
+    
+    if limit is not None and len(contributions) > limit:
+        contributions = contributions[:limit]
+        last = contributions[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    
+    return contributions
+
+
+@router.get("/items/{item_id}/contributions/summary", response_model=ContributionSummaryResponse)
+async def get_contribution_summary(
+    item_id: UUID,
+    top: int = Query(5, ge=0, le=50),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all contributions for an item (public endpoint)."""
-    result = await db.execute(select(Item).where(Item.id == item_id))
-    item = result.scalar_one_or_none()
+    """Funding progress of an item and its top contributors in a single query (public endpoint).
+    
+    Totals come from the running counters on the item; contributors are
+    grouped by user or guest name and ranked by amount. Items of deleted
+    wishlists are not found.
+    """
+    top_contributors = (
+        select(
+            Contribution.user_id,
+            Contribution.guest_name,
+            func.sum(Contribution.amount).label("amount"),
+            func.count(Contribution.id).label("count"),
+            func.min(Contribution.created_at).label("first_at"),
+        )
+        .where(Contribution.item_id == item_id)
+        .group_by(Contribution.user_id, Contribution.guest_name)
+        .order_by(func.sum(Contribution.amount).desc(), func.min(Contribution.created_at))
+        .limit(top)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            Item.price,
+            Item.funded_amount,
+            Item.contribution_count,
+            top_contributors.c.user_id,
+            top_contributors.c.guest_name,
+            top_contributors.c.amount,
+            top_contributors.c.count,
+        )
+        .select_from(Item)
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .outerjoin(top_contributors, true())
+        .where(Item.id == item_id, Wishlist.deleted_at.is_(None))
+        .order_by(top_contributors.c.amount.desc(), top_contributors.c.first_at)
+    )
+    rows = result.all()
     
-    if not item:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found"
         )
     
-    contrib_result = await db.execute(
-        select(Contribution).where(Contribution.item_id == item_id).order_by(Contribution.created_at)
+    price, total, count = rows[0][:3]
+    return ContributionSummaryResponse(
+        item_id=item_id,
+        price=price,
+        total=total,
+        count=count,
+        remaining=max(price - total, 0),
+        percent_funded=round(float(total / price * 100), 2) if price else 0.0,
+        top_contributors=[
+            ContributorSummary(name=display_name(guest_name, user_id), amount=amount, count=contributor_count)
+            for *_, user_id, guest_name, amount, contributor_count in rows
+            if amount is not None
+        ],
     )
-    contributions = contrib_result.scalars().all()
-    
-    return contributions
-
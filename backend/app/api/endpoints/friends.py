@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, or_, and_, func, tuple_, union_all, cast, Integer
+from typing import List, Optional
 from uuid import UUID
-from app.db.session import get_db
+from datetime import datetime
+from app.db.session import get_db, get_read_db
 from app.db.models.user import User
+from app.schemas.user import CurrentUser
 from app.db.models.friendship import Friendship, FriendshipStatus
 from app.db.models.wishlist import Wishlist
 from app.db.models.item import Item
@@ -13,9 +16,12 @@ from app.schemas.friendship import (
     FriendshipUpdate,
     FriendshipResponse,
     UserFriendResponse,
-    FriendWishlistResponse
+    FriendWishlistResponse,
+    FriendFeedWishlistResponse,
+    FriendFeedResponse
 )
 from app.api.deps import get_current_user
+from app.core.pagination import MAX_PAGE_SIZE, encode_cursor, decode_cursor
 from app.core.websocket_manager import ws_manager
 
 router = APIRouter()
@@ -24,7 +30,7 @@ router = APIRouter()
 @router.post("/friends/request", response_model=FriendshipResponse, status_code=status.HTTP_201_CREATED)
 async def send_friend_request(
     friendship_data: FriendshipCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Send a friend request to another user."""
@@ -43,19 +49,12 @@ async def send_friend_request(
             detail="User not found"
         )
 
-    # Check if friendship already exists
+    # Check if friendship already exists (either direction shares one canonical row)
+    user_low, user_high = Friendship.canonical_pair(current_user.id, friendship_data.addressee_id)
     existing_result = await db.execute(
         select(Friendship).where(
-            or_(
-                and_(
-                    Friendship.requester_id == current_user.id,
-                    Friendship.addressee_id == friendship_data.addressee_id
-                ),
-                and_(
-                    Friendship.requester_id == friendship_data.addressee_id,
-                    Friendship.addressee_id == current_user.id
-                )
-            )
+            Friendship.user_low == user_low,
+            Friendship.user_high == user_high
         )
     )
     existing = existing_result.scalar_one_or_none()
@@ -84,11 +83,21 @@ async def send_friend_request(
     new_friendship = Friendship(
         requester_id=current_user.id,
         addressee_id=friendship_data.addressee_id,
+        user_low=user_low,
+        user_high=user_high,
         status=FriendshipStatus.PENDING
     )
 
     db.add(new_friendship)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request for the same pair won the unique constraint
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Friend request already pending"
+        )
     await db.refresh(new_friendship)
 
     return new_friendship
@@ -98,7 +107,7 @@ async def send_friend_request(
 async def update_friendship(
     friendship_id: UUID,
     friendship_data: FriendshipUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Accept or reject a friend request."""
@@ -133,22 +142,22 @@ async def update_friendship(
 
 @router.get("/friends", response_model=List[UserFriendResponse])
 async def get_friends(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get list of accepted friends."""
-    # Get friendships where user is requester or addressee and status is ACCEPTED
+    # Get friendships where user is either side of the pair and status is ACCEPTED
     result = await db.execute(
         select(User).join(
             Friendship,
             or_(
                 and_(
-                    Friendship.requester_id == current_user.id,
-                    User.id == Friendship.addressee_id
+                    Friendship.user_low == current_user.id,
+                    User.id == Friendship.user_high
                 ),
                 and_(
-                    Friendship.addressee_id == current_user.id,
-                    User.id == Friendship.requester_id
+                    Friendship.user_high == current_user.id,
+                    User.id == Friendship.user_low
                 )
             )
         ).where(Friendship.status == FriendshipStatus.ACCEPTED)
@@ -160,7 +169,7 @@ async def get_friends(
 
 @router.get("/friends/pending", response_model=List[FriendshipResponse])
 async def get_pending_requests(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get pending friend requests (both sent and received)."""
@@ -183,71 +192,124 @@ async def get_pending_requests(
 @router.get("/friends/{friend_id}/wishlists", response_model=List[FriendWishlistResponse])
 async def get_friend_wishlists(
     friend_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get wishlists of a friend."""
-    # Check if users are friends
+    # Check if users are friends with a single probe of the pair index
+    user_low, user_high = Friendship.canonical_pair(current_user.id, friend_id)
     friendship_result = await db.execute(
-        select(Friendship).where(
-            and_(
-                Friendship.status == FriendshipStatus.ACCEPTED,
-                or_(
-                    and_(
-                        Friendship.requester_id == current_user.id,
-                        Friendship.addressee_id == friend_id
-                    ),
-                    and_(
-                        Friendship.requester_id == friend_id,
-                        Friendship.addressee_id == current_user.id
-                    )
-                )
-            )
+        select(Friendship.status).where(
+            Friendship.user_low == user_low,
+            Friendship.user_high == user_high
         )
     )
-    friendship = friendship_result.scalar_one_or_none()
+    friendship_status = friendship_result.scalar_one_or_none()
 
-    if not friendship:
+    if friendship_status != FriendshipStatus.ACCEPTED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not friends with this user"
         )
 
-    # Get friend's wishlists (all wishlists of the friend)
+    # Get friend's wishlists with item counts from one grouped subquery
+    items_count = (
+        select(Item.wishlist_id, func.count(Item.id).label("items_count"))
+        .where(Item.wishlist_id.in_(select(Wishlist.id).where(Wishlist.owner_id == friend_id, Wishlist.deleted_at.is_(None))))
+        .group_by(Item.wishlist_id)
+        .subquery()
+    )
     wishlists_result = await db.execute(
-        select(Wishlist).where(
-            Wishlist.owner_id == friend_id
-        ).order_by(Wishlist.created_at.desc())
+        select(Wishlist, func.coalesce(items_count.c.items_count, 0))
+        .outerjoin(items_count, items_count.c.wishlist_id == Wishlist.id)
+        .where(Wishlist.owner_id == friend_id, Wishlist.deleted_at.is_(None))
+        .order_by(Wishlist.created_at.desc())
     )
-    wishlists = wishlists_result.scalars().all()
 
-    # Get items count for each wishlist
-    wishlist_responses = []
-    for wishlist in wishlists:
-        items_count_result = await db.execute(
-            select(func.count(Item.id)).where(Item.wishlist_id == wishlist.id)
+    return [
+        FriendWishlistResponse(
+            id=wishlist.id,
+            title=wishlist.title,
+            description=wishlist.description,
+            slug=wishlist.slug,
+            created_at=wishlist.created_at,
+            updated_at=wishlist.updated_at,
+            items_count=count,
         )
-        items_count = items_count_result.scalar() or 0
+        for wishlist, count in wishlists_result.all()
+    ]
 
-        wishlist_dict = {
-            "id": wishlist.id,
-            "title": wishlist.title,
-            "description": wishlist.description,
-            "slug": wishlist.slug,
-            "is_public": wishlist.is_public,
-            "created_at": wishlist.created_at,
-            "updated_at": wishlist.updated_at,
-            "items_count": items_count,
-        }
-        wishlist_responses.append(FriendWishlistResponse(**wishlist_dict))
 
-    return wishlist_responses
+@router.get("/friends/feed", response_model=FriendFeedResponse)
+async def get_friends_feed(
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get recently updated wishlists across all accepted friends.
+    
+    One keyset-paginated query ordered by last activity; pass ``next_cursor``
+    back as ``after`` for the next page.
+    """
+    friend_ids = union_all(
+        select(Friendship.user_high).where(
+            Friendship.user_low == current_user.id,
+            Friendship.status == FriendshipStatus.ACCEPTED
+        ),
+        select(Friendship.user_low).where(
+            Friendship.user_high == current_user.id,
+            Friendship.status == FriendshipStatus.ACCEPTED
+        ),
+    )
+    last_activity = func.coalesce(Wishlist.updated_at, Wishlist.created_at)
+    items_count = (
+        select(func.count(Item.id))
+        .where(Item.wishlist_id == Wishlist.id)
+        .correlate(Wishlist)
+        .scalar_subquery()
+    )
+
+    query = (
+        select(Wishlist, User.full_name, User.email, items_count, last_activity)
+        .join(User, User.id == Wishlist.owner_id)
+        .where(Wishlist.owner_id.in_(friend_ids), Wishlist.deleted_at.is_(None))
+        .order_by(last_activity.desc(), Wishlist.id.desc())
+        .limit(limit + 1)
+    )
+    if after:
+        after_activity, after_id = decode_cursor(after, datetime.fromisoformat, UUID)
+        query = query.where(tuple_(last_activity, Wishlist.id) < (after_activity, after_id))
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_wishlist, *_, activity = rows[-1]
+        next_cursor = encode_cursor(activity, last_wishlist.id)
+
+    wishlists = [
+        FriendFeedWishlistResponse(
+            id=wishlist.id,
+            title=wishlist.title,
+            description=wishlist.description,
+            slug=wishlist.slug,
+            created_at=wishlist.created_at,
+            updated_at=wishlist.updated_at,
+            items_count=count,
+            owner_id=wishlist.owner_id,
+            owner_name=full_name or email,
+        )
+        for wishlist, full_name, email, count, _ in rows
+    ]
+
+    return FriendFeedResponse(wishlists=wishlists, next_cursor=next_cursor)
 
 
 @router.delete("/friends/{friendship_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_friendship(
     friendship_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a friendship (unfriend)."""
@@ -273,31 +335,69 @@ async def delete_friendship(
     return None
 
 
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 @router.get("/users/search", response_model=List[UserFriendResponse])
 async def search_users(
     query: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Search for users by email or name."""
-    if len(query) < 2:
+    """Search for users by email or name.
+    
+    Queries containing "@" are treated as email lookups and use the prefix
+    index on lower(email). Everything else is a substring match served by the
+    pg_trgm GIN indexes and ranked by similarity. The cursor for the next page
+    is returned in the X-Next-Cursor header.
+    """
+    term = query.strip().lower()
+    if len(term) < 2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Query must be at least 2 characters"
         )
 
-    result = await db.execute(
-        select(User).where(
-            and_(
-                User.id != current_user.id,
-                or_(
-                    User.email.ilike(f"%{query}%"),
-                    User.full_name.ilike(f"%{query}%")
-                )
-            )
-        ).limit(20)
+    email = func.lower(User.email)
+    pattern = _escape_like(term)
+    if "@" in term:
+        match = email.like(f"{pattern}%", escape="\\")
+    else:
+        match = or_(
+            email.like(f"%{pattern}%", escape="\\"),
+            User.full_name.ilike(f"%{pattern}%", escape="\\")
+        )
+
+    # Integer similarity score, so keyset comparisons are exact
+    score = cast(
+        func.greatest(
+            func.similarity(email, term),
+            func.coalesce(func.similarity(User.full_name, term), 0)
+        ) * 10000,
+        Integer
+    )
+
+    search = (
+        select(User, score)
+        .where(User.id != current_user.id, match)
+        .order_by(score.desc(), User.id)
+        .limit(limit + 1)
     )
-    users = result.scalars().all()
+    if after:
+        after_score, after_id = decode_cursor(after, int, UUID)
+        search = search.where(
+            or_(score < after_score, and_(score == after_score, User.id > after_id))
+        )
 
-    return users
+    rows = (await db.execute(search)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_user, last_score = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last_score, last_user.id)
 
+    return [user for user, _ in rows]
@@ -1,15 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Response, Request, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
-from app.db.session import get_db
-from app.db.models.user import User
+from datetime import datetime
+import asyncio
+from app.db.session import get_db, release_db, get_read_db
+from app.db.base import AsyncSessionLocal
+from app.db.routing import read_guard
+from app.schemas.user import CurrentUser
 from app.db.models.wishlist import Wishlist
 from app.db.models.item import Item
-from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse
+from app.schemas.item import (
+    ItemCreate, ItemUpdate, ItemResponse, ItemBatchCreate, ItemBatchResponse,
+    ItemImportError, ItemImportResponse,
+)
 from app.api.deps import get_current_user, get_optional_user
 from app.core.websocket_manager import ws_manager
+from app.core.cache import wishlist_cache
+from app.core.pagination import MAX_PAGE_SIZE, decode_cursor
+from app.core.config import settings
+from app.services.wishlist_loader import load_item_page, item_base_fields
+from app.services.item_writer import validate_item_row, validate_item_rows, insert_items
+from app.services.item_import import IMPORT_FORMATS, detect_format, parse_upload, needs_autofill
+from app.api.endpoints.autofill import fetch_product_info
+from app.services.wishlist_version import bump_wishlist_version, make_etag, etag_matches
 
 router = APIRouter()
 
@@ -17,52 +32,65 @@ router = APIRouter()
 @router.get("/wishlists/{slug}/items", response_model=List[ItemResponse])
 async def get_items(
     slug: str,
-    current_user: User | None = Depends(get_optional_user),
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    min_version: Optional[int] = Query(None, ge=1),
+    if_none_match: Optional[str] = Header(None),
+    current_user: CurrentUser | None = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all items for a wishlist."""
-    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug))
-    wishlist = result.scalar_one_or_none()
+    """Get the items of a wishlist, newest first.
     
-    if not wishlist:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Wishlist not found"
-        )
+    Pass ``limit`` to page through long lists; the cursor for the next page is
+    returned in the X-Next-Cursor header and goes back in ``after``. Answers a
+    matching If-None-Match with 304 after the wishlist lookup. Like
+    GET /wishlists/{slug}, reads from the primary while the replica is older
+    than ``min_version``.
+    """
+    cursor = decode_cursor(after, datetime.fromisoformat, UUID) if after else None
     
-    items_result = await db.execute(
-        select(Item).where(Item.wishlist_id == wishlist.id).order_by(Item.created_at.desc())
-    )
-    items = items_result.scalars().all()
+    async def find_wishlist(session: AsyncSession) -> Optional[Wishlist]:
+        result = await session.execute(select(Wishlist).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
+        return result.scalar_one_or_none()
     
-    # Convert to response format to avoid lazy loading issues
-    item_responses = []
-    for item in items:
-        item_dict = {
-            "id": item.id,
-            "wishlist_id": item.wishlist_id,
-            "title": item.title,
-            "url": item.url,
-            "price": item.price,
-            "image_url": item.image_url,
-            "is_group_gift": item.is_group_gift,
-            "created_at": item.created_at,
-            "updated_at": item.updated_at,
-        }
-        item_responses.append(ItemResponse(**item_dict))
-    
-    return item_responses
+    async def respond(session: AsyncSession, wishlist: Optional[Wishlist]):
+        if not wishlist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Wishlist not found"
+            )
+        
+        etag = make_etag(wishlist.id, wishlist.version, "items")
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        
+        item_responses, next_cursor = await load_item_page(session, wishlist.id, limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        
+        return item_responses
+    
+    wishlist = await find_wishlist(db)
+    # A replica that is behind may also not have the wishlist at all yet
+    if read_guard.replica_is_behind(db, wishlist.version if wishlist else None, min_version):
+        await release_db(db)
+        async with AsyncSessionLocal() as primary:
+            return await respond(primary, await find_wishlist(primary))
+    return await respond(db, wishlist)
 
 
 @router.post("/wishlists/{slug}/items", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_item(
     slug: str,
     item_data: ItemCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new item in a wishlist (owner only)."""
-    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug))
+    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
     wishlist = result.scalar_one_or_none()
     
     if not wishlist:
@@ -88,11 +116,14 @@ async def create_item(
     )
     
     db.add(new_item)
+    version = await bump_wishlist_version(db, wishlist.id)
     await db.commit()
     await db.refresh(new_item)
+    await release_db(db)
     
-    # Broadcast update
-    await ws_manager.broadcast_wishlist_update(slug)
+    # Invalidate cached views and broadcast update
+    wishlist_cache.invalidate(slug)
+    await ws_manager.broadcast_wishlist_update(slug, version)
     
     # Convert to response format to avoid lazy loading issues
     item_dict = {
@@ -110,15 +141,222 @@ async def create_item(
     return ItemResponse(**item_dict)
 
 
+@router.post("/wishlists/{slug}/items:batch", response_model=ItemBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_items_batch(
+    slug: str,
+    batch: ItemBatchCreate,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create many items in a wishlist at once (owner only).
+    
+    Every row is validated as an ItemCreate. By default any invalid row
+    rejects the whole batch with 422 and per-row errors; with ``partial`` the
+    valid rows are inserted and the invalid ones are reported in ``errors``.
+    Valid rows go in with one INSERT, one commit and one broadcast.
+    """
+    if len(batch.items) > settings.ITEM_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ITEM_BATCH_MAX_SIZE} items per batch"
+        )
+    
+    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
+    wishlist = result.scalar_one_or_none()
+    
+    if not wishlist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wishlist not found"
+        )
+    
+    if wishlist.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add items to this wishlist"
+        )
+    
+    valid_items, errors = validate_item_rows(batch.items)
+    if errors and not batch.partial:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+    
+    if not valid_items:
+        return ItemBatchResponse(created=[], errors=errors)
+    
+    new_items = await insert_items(db, wishlist.id, current_user.id, valid_items)
+    version = await bump_wishlist_version(db, wishlist.id)
+    await db.commit()
+    
+    created = [ItemResponse(**item_base_fields(item)) for item in new_items]
+    
+    # Invalidate cached views and broadcast update once for the whole batch
+    wishlist_cache.invalidate(slug)
+    await ws_manager.broadcast_wishlist_update(slug, version)
+    
+    return ItemBatchResponse(created=created, errors=errors)
+
+
+async def _autofill_import_rows(slug: str, wishlist_id: UUID, created_by: UUID, rows: List[Tuple[int, Dict[str, Any]]]):
+    """Background step of an import: fetch product info for URL-only rows and insert them.
+    
+    Values given in the upload win over fetched ones. Runs after the response
+    with its own session and reports the outcome over the wishlist room; a
+    row that fails for any reason counts as failed without stopping the
+    others, and the client is always told when autofill is done.
+    """
+    semaphore = asyncio.Semaphore(settings.IMPORT_AUTOFILL_CONCURRENCY)
+    
+    async def fill(line: int, row: Dict[str, Any]) -> Optional[ItemCreate]:
+        try:
+            async with semaphore:
+                info = await fetch_product_info(row["url"])
+            merged = dict(row)
+            for field, value in info.model_dump().items():
+                if value is not None and merged.get(field) in (None, ""):
+                    merged[field] = value
+            item, _ = validate_item_row(merged)
+            return item
+        except HTTPException:
+            return None
+        except Exception as e:
+            # e.g. markup the product page parser chokes on
+            print(f"⚠️ Import autofill for {slug} line {line} failed: {e}")
+            return None
+    
+    valid_items: List[ItemCreate] = []
+    try:
+        filled = await asyncio.gather(*(fill(line, row) for line, row in rows))
+        valid_items = [item for item in filled if item is not None]
+        
+        if valid_items:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await insert_items(db, wishlist_id, created_by, valid_items)
+                    version = await bump_wishlist_version(db, wishlist_id)
+                    await db.commit()
+            except Exception as e:
+                print(f"⚠️ Import autofill for {slug} failed: {e}")
+                valid_items = []
+            else:
+                wishlist_cache.invalidate(slug)
+                await ws_manager.broadcast_wishlist_update(slug, version)
+    finally:
+        await ws_manager.broadcast_to_room(slug, {
+            "type": "import_autofill_done",
+            "slug": slug,
+            "created": len(valid_items),
+            "failed": len(rows) - len(valid_items),
+        })
+
+
+@router.post("/wishlists/{slug}/import", response_model=ItemImportResponse)
+async def import_items(
+    slug: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    autofill: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Import items into a wishlist from a streamed CSV or NDJSON upload (owner only).
+    
+    The body is parsed row by row as it arrives and valid rows are inserted
+    and committed every IMPORT_BATCH_SIZE rows, so a failed upload keeps the
+    batches committed before it. Progress goes to the ``/ws/{slug}`` room as
+    ``import_progress`` messages. CSV needs a header row with ItemCreate field
+    names. With ``autofill`` rows that have a URL but no title or price are
+    completed from the product page in the background.
+    """
+    import_format = format or detect_format(request.headers.get("content-type"))
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass format=csv or format=ndjson, or send a text/csv or application/x-ndjson body"
+        )
+    
+    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
+    wishlist = result.scalar_one_or_none()
+    
+    if not wishlist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wishlist not found"
+        )
+    
+    if wishlist.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add items to this wishlist"
+        )
+    # Don't hold the connection and an open transaction while the upload streams in
+    await release_db(db)
+    
+    progress = {"processed": 0, "created": 0, "failed": 0}
+    errors: List[ItemImportError] = []
+    batch: List[ItemCreate] = []
+    autofill_rows: List[Tuple[int, Dict[str, Any]]] = []
+    version = None
+    
+    def reject(line: int, row_errors: List[Dict[str, Any]]):
+        progress["failed"] += 1
+        if len(errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            errors.append(ItemImportError(line=line, errors=row_errors))
+    
+    async def flush():
+        nonlocal version
+        if batch:
+            await insert_items(db, wishlist.id, current_user.id, batch)
+            version = await bump_wishlist_version(db, wishlist.id)
+            await db.commit()
+            progress["created"] += len(batch)
+            batch.clear()
+            wishlist_cache.invalidate(slug)
+        await ws_manager.broadcast_to_room(slug, {"type": "import_progress", "slug": slug, **progress})
+    
+    async for line, row, parse_error in parse_upload(request.stream(), import_format):
+        progress["processed"] += 1
+        if parse_error:
+            reject(line, [{"type": "parse_error", "msg": parse_error}])
+        elif autofill and needs_autofill(row):
+            if len(autofill_rows) < settings.IMPORT_AUTOFILL_MAX_ROWS:
+                autofill_rows.append((line, row))
+            else:
+                reject(line, [{"type": "autofill_limit", "msg": "Too many rows to autofill in one import"}])
+        else:
+            item, row_errors = validate_item_row(row)
+            if item is None:
+                reject(line, row_errors)
+            else:
+                batch.append(item)
+                if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                    await flush()
+    await flush()
+    
+    if progress["created"]:
+        await ws_manager.broadcast_wishlist_update(slug, version)
+    if autofill_rows:
+        background_tasks.add_task(_autofill_import_rows, slug, wishlist.id, current_user.id, autofill_rows)
+    
+    return ItemImportResponse(**progress, autofill_queued=len(autofill_rows), errors=errors)
+
+
 @router.put("/items/{item_id}", response_model=ItemResponse)
 async def update_item(
     item_id: UUID,
     item_data: ItemUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update an item (owner only)."""
-    result = await db.execute(select(Item).where(Item.id == item_id))
+    result = await db.execute(
+        select(Item)
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .where(Item.id == item_id, Wishlist.deleted_at.is_(None))
+    )
     item = result.scalar_one_or_none()
     
     if not item:
@@ -148,11 +386,14 @@ async def update_item(
     if item_data.is_group_gift is not None:
         item.is_group_gift = item_data.is_group_gift
     
+    version = await bump_wishlist_version(db, wishlist.id)
     await db.commit()
     await db.refresh(item)
+    await release_db(db)
     
-    # Broadcast update
-    await ws_manager.broadcast_wishlist_update(wishlist.slug)
+    # Invalidate cached views and broadcast update
+    wishlist_cache.invalidate(wishlist.slug)
+    await ws_manager.broadcast_wishlist_update(wishlist.slug, version)
     
     # Convert to response format to avoid lazy loading issues
     item_dict = {
@@ -173,11 +414,15 @@ async def update_item(
 @router.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_item(
     item_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete an item (owner only)."""
-    result = await db.execute(select(Item).where(Item.id == item_id))
+    result = await db.execute(
+        select(Item)
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .where(Item.id == item_id, Wishlist.deleted_at.is_(None))
+    )
     item = result.scalar_one_or_none()
     
     if not item:
@@ -200,10 +445,12 @@ async def delete_item(
     
     # Delete the item using proper SQLAlchemy 2.0 syntax
     await db.execute(delete(Item).where(Item.id == item_id))
+    version = await bump_wishlist_version(db, wishlist.id)
     await db.commit()
     
-    # Broadcast update
-    await ws_manager.broadcast_wishlist_update(slug)
+    # Invalidate cached views and broadcast update
+    wishlist_cache.invalidate(slug)
+    await ws_manager.broadcast_wishlist_update(slug, version)
     
     return None
 
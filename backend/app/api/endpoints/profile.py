@@ -2,9 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.db.models.user import User
-from app.schemas.user import UserProfileUpdate, UserResponse, UserPublicProfile
+from app.schemas.user import UserProfileUpdate, UserResponse, UserPublicProfile, CurrentUser
 from app.api.deps import get_current_user, get_optional_user
 
 router = APIRouter()
@@ -12,7 +12,7 @@ router = APIRouter()
 
 @router.get("/profile", response_model=UserResponse)
 async def get_my_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user's profile."""
@@ -22,36 +22,40 @@ async def get_my_profile(
 @router.put("/profile", response_model=UserResponse)
 async def update_my_profile(
     profile_data: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update current user's profile."""
+    result = await db.execute(select(User).where(User.id == current_user.id))
+    user = result.scalar_one()
+    
     if profile_data.full_name is not None:
-        current_user.full_name = profile_data.full_name
+        user.full_name = profile_data.full_name
     if profile_data.bio is not None:
-        current_user.bio = profile_data.bio
+        user.bio = profile_data.bio
     if profile_data.birthday is not None:
-        current_user.birthday = profile_data.birthday
+        user.birthday = profile_data.birthday
     if profile_data.location is not None:
-        current_user.location = profile_data.location
+        user.location = profile_data.location
     if profile_data.phone is not None:
-        current_user.phone = profile_data.phone
+        user.phone = profile_data.phone
     if profile_data.website is not None:
-        current_user.website = profile_data.website
+        user.website = profile_data.website
     if profile_data.avatar_url is not None:
-        current_user.avatar_url = profile_data.avatar_url
+        user.avatar_url = profile_data.avatar_url
 
+    # Committing drops the cached principal (see app.api.deps)
     await db.commit()
-    await db.refresh(current_user)
+    await db.refresh(user)
 
-    return current_user
+    return user
 
 
 @router.get("/users/{user_id}/profile", response_model=UserPublicProfile)
 async def get_user_profile(
     user_id: UUID,
-    current_user: User | None = Depends(get_optional_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser | None = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get public profile of a user."""
     result = await db.execute(select(User).where(User.id == user_id))
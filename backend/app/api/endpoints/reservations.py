@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select
 from uuid import UUID
 from app.db.session import get_db
-from app.db.models.user import User
+from app.schemas.user import CurrentUser
 from app.db.models.item import Item
-from app.db.models.reservation import Reservation
 from app.db.models.wishlist import Wishlist
 from app.schemas.reservation import ReservationCreate, ReservationResponse
 from app.api.deps import get_optional_user
 from app.core.websocket_manager import ws_manager
+from app.core.cache import wishlist_cache
+from app.services.reservation_writer import insert_reservation
 
 router = APIRouter()
 
@@ -18,75 +19,69 @@ router = APIRouter()
 async def reserve_item(
     item_id: UUID,
     reservation_data: ReservationCreate,
-    current_user: User | None = Depends(get_optional_user),
+    response: Response,
+    current_user: CurrentUser | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Reserve an item (single-payer gift)."""
-    # Get item with lock to prevent concurrent reservations
-    result = await db.execute(
-        select(Item).where(Item.id == item_id).with_for_update()
-    )
-    item = result.scalar_one_or_none()
-    
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Item not found"
-        )
+    """Reserve an item (single-payer gift).
     
-    # Check if item is a group gift
-    if item.is_group_gift:
+    One INSERT ... ON CONFLICT DO NOTHING guarded by the unique item_id
+    replaces the lock, check and insert; only a failed reservation costs a
+    second query to pick 404, 400 or 409.
+    """
+    # Require guest_name if not authenticated
+    if not current_user and not reservation_data.guest_name:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot reserve a group gift item"
+            detail="Guest name is required for unauthenticated users"
         )
     
-    # Check if already reserved
-    existing_result = await db.execute(
-        select(Reservation).where(Reservation.item_id == item_id)
+    reserved = await insert_reservation(
+        db,
+        item_id,
+        user_id=current_user.id if current_user else None,
+        guest_name=reservation_data.guest_name if not current_user else None,
     )
-    existing_reservation = existing_result.scalar_one_or_none()
     
-    if existing_reservation:
+    if reserved is None:
+        await db.rollback()
+        result = await db.execute(
+            select(Item.is_group_gift)
+            .join(Wishlist, Wishlist.id == Item.wishlist_id)
+            .where(Item.id == item_id, Wishlist.deleted_at.is_(None))
+        )
+        is_group_gift = result.scalar_one_or_none()
+        
+        if is_group_gift is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
+            )
+        
+        if is_group_gift:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot reserve a group gift item"
+            )
+        
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Item is already reserved"
         )
     
-    # Require guest_name if not authenticated
-    if not current_user and not reservation_data.guest_name:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Guest name is required for unauthenticated users"
-        )
-    
-    # Create reservation
-    new_reservation = Reservation(
-        item_id=item_id,
-        user_id=current_user.id if current_user else None,
-        guest_name=reservation_data.guest_name if not current_user else None
-    )
-    
-    db.add(new_reservation)
     await db.commit()
-    await db.refresh(new_reservation)
     
-    # Get wishlist slug for WebSocket broadcast
-    wishlist_result = await db.execute(select(Wishlist).where(Wishlist.id == item.wishlist_id))
-    wishlist = wishlist_result.scalar_one()
-    
-    # Broadcast update immediately
-    await ws_manager.broadcast_wishlist_update(wishlist.slug)
+    # Invalidate cached views and broadcast update immediately
+    wishlist_cache.invalidate(reserved.slug)
+    await ws_manager.broadcast_wishlist_update(reserved.slug, reserved.version)
+    # Lets guests, who are not kept on the primary, read their write back via min_version
+    response.headers["X-Wishlist-Version"] = str(reserved.version)
     
     # Convert to response format
-    from app.schemas.reservation import ReservationResponse
     reservation_dict = {
-        "id": new_reservation.id,
-        "item_id": new_reservation.item_id,
-        "user_id": new_reservation.user_id,
-        "guest_name": new_reservation.guest_name,
-        "created_at": new_reservation.created_at,
+        "id": reserved.id,
+        "item_id": reserved.item_id,
+        "guest_name": reserved.guest_name,
     }
     
     return ReservationResponse(**reservation_dict)
-
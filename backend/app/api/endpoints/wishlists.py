@@ -1,105 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, BackgroundTasks
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List
+from sqlalchemy import select, update, func
+from typing import List, Optional, Union
 from uuid import UUID
+from datetime import datetime
 import shortuuid
-from app.db.session import get_db
-from app.db.models.user import User
+from app.db.session import get_db, get_read_db, release_db
+from app.db.base import AsyncSessionLocal
+from app.db.routing import read_guard
+from app.schemas.user import CurrentUser
 from app.db.models.wishlist import Wishlist
-from app.db.models.item import Item
-from app.db.models.reservation import Reservation
-from app.db.models.contribution import Contribution
-from app.schemas.wishlist import WishlistCreate, WishlistUpdate, WishlistResponse, WishlistPublicResponse
-from app.schemas.item import ItemResponse, ContributionInfo
+from app.schemas.wishlist import WishlistCreate, WishlistUpdate, WishlistResponse, WishlistSummaryResponse
 from app.api.deps import get_current_user, get_optional_user
-from decimal import Decimal
+from app.core.cache import wishlist_cache
+from app.core.websocket_manager import ws_manager
+from app.core.pagination import MAX_PAGE_SIZE, decode_cursor
+from app.services.wishlist_export import EXPORT_MEDIA_TYPES, stream_export
+from app.services.wishlist_purge import has_many_items, delete_wishlist_now, purge_wishlist_in_background
+from app.services.wishlist_version import bump_wishlist_version, make_etag, etag_matches
+from app.services.wishlist_loader import (
+    load_wishlist_view,
+    load_owner_dashboard,
+    load_owner_summary,
+)
 
 router = APIRouter()
 
 
-@router.get("", response_model=List[WishlistResponse])
+@router.get("", response_model=Union[List[WishlistResponse], List[WishlistSummaryResponse]])
 async def get_my_wishlists(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    summary: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all wishlists owned by the current user."""
-    from sqlalchemy.orm import selectinload
-    
-    result = await db.execute(
-        select(Wishlist)
-        .where(Wishlist.owner_id == current_user.id)
-        .options(selectinload(Wishlist.items))
-        .order_by(Wishlist.created_at.desc())
-    )
-    wishlists = result.scalars().all()
+    """Get all wishlists owned by the current user.
     
-    # Convert to response format
-    wishlist_responses = []
-    for wishlist in wishlists:
-        # Load items explicitly
-        items_result = await db.execute(
-            select(Item).where(Item.wishlist_id == wishlist.id).order_by(Item.created_at.desc())
-        )
-        items = items_result.scalars().all()
-        
-        # Build item responses
-        item_responses = []
-        for item in items:
-            item_data = {
-                "id": item.id,
-                "wishlist_id": item.wishlist_id,
-                "title": item.title,
-                "url": item.url,
-                "price": item.price,
-                "image_url": item.image_url,
-                "is_group_gift": item.is_group_gift,
-                "created_at": item.created_at,
-                "updated_at": item.updated_at,
-            }
-            
-            # Owner view: only status
-            if item.is_group_gift:
-                contrib_result = await db.execute(
-                    select(func.coalesce(func.sum(Contribution.amount), 0)).where(
-                        Contribution.item_id == item.id
-                    )
-                )
-                total_contributions = contrib_result.scalar() or Decimal("0")
-                if total_contributions >= item.price:
-                    item_data["status"] = "Collected"
-                else:
-                    item_data["status"] = "Collecting"
-                item_data["is_reserved"] = False
-            else:
-                res_result = await db.execute(
-                    select(Reservation).where(Reservation.item_id == item.id)
-                )
-                reservation = res_result.scalar_one_or_none()
-                item_data["is_reserved"] = reservation is not None
-                item_data["status"] = "Reserved" if reservation else None
-            
-            item_responses.append(ItemResponse(**item_data))
-        
-        wishlist_dict = {
-            "id": wishlist.id,
-            "slug": wishlist.slug,
-            "title": wishlist.title,
-            "description": wishlist.description,
-            "owner_id": wishlist.owner_id,
-            "created_at": wishlist.created_at,
-            "updated_at": wishlist.updated_at,
-            "items": item_responses,
-        }
-        wishlist_responses.append(WishlistResponse(**wishlist_dict))
+    With ``summary=true`` only per-wishlist counts and funding totals are
+    returned instead of every item.
+    """
+    if summary:
+        return await load_owner_summary(db, current_user.id)
     
-    return wishlist_responses
+    return await load_owner_dashboard(db, current_user.id)
 
 
 @router.post("", response_model=WishlistResponse, status_code=status.HTTP_201_CREATED)
 async def create_wishlist(
     wishlist_data: WishlistCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new wishlist."""
@@ -132,15 +81,29 @@ async def create_wishlist(
     return WishlistResponse(**wishlist_dict)
 
 
-@router.get("/{slug}")
-async def get_wishlist(
+@router.get("/export")
+async def export_my_wishlists(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Export every wishlist of the current user as a streamed NDJSON or CSV download."""
+    return StreamingResponse(
+        stream_export(current_user.id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="wishlists.{format}"'},
+    )
+
+
+@router.get("/{slug}/export")
+async def export_wishlist(
     slug: str,
-    current_user: User | None = Depends(get_optional_user),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get a wishlist by slug. Returns different data based on ownership."""
-    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug))
-    wishlist = result.scalar_one_or_none()
+    """Export one wishlist as a streamed NDJSON or CSV download (owner only)."""
+    result = await db.execute(select(Wishlist.id, Wishlist.owner_id).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
+    wishlist = result.one_or_none()
     
     if not wishlist:
         raise HTTPException(
@@ -148,116 +111,88 @@ async def get_wishlist(
             detail="Wishlist not found"
         )
     
-    # Check if current user is owner
-    is_owner = current_user and wishlist.owner_id == current_user.id
+    if wishlist.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export this wishlist"
+        )
     
-    # Load items
-    items_result = await db.execute(
-        select(Item).where(Item.wishlist_id == wishlist.id).order_by(Item.created_at.desc())
+    return StreamingResponse(
+        stream_export(current_user.id, format, wishlist_id=wishlist.id),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{slug}.{format}"'},
     )
-    items = items_result.scalars().all()
+
+
+@router.get("/{slug}")
+async def get_wishlist(
+    slug: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    min_version: Optional[int] = Query(None, ge=1),
+    if_none_match: Optional[str] = Header(None),
+    current_user: CurrentUser | None = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a wishlist by slug. Returns different data based on ownership.
+    
+    Pass ``limit`` to page through the items; ``next_cursor`` in the response
+    goes back in ``after`` for the next page. Responses carry a strong ETag
+    derived from the wishlist version, and a matching If-None-Match is
+    answered with 304 without loading any items. Pass the ``version`` of a
+    wishlist_updated event as ``min_version`` to be served from the primary
+    while the replica is older than that.
+    """
+    cursor = decode_cursor(after, datetime.fromisoformat, UUID) if after else None
+    
+    async def find_wishlist(session: AsyncSession) -> Optional[Wishlist]:
+        result = await session.execute(select(Wishlist).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
+        return result.scalar_one_or_none()
     
-    # Build item responses with aggregated data
-    item_responses = []
-    for item in items:
-        item_data = {
-            "id": item.id,
-            "wishlist_id": item.wishlist_id,
-            "title": item.title,
-            "url": item.url,
-            "price": item.price,
-            "image_url": item.image_url,
-            "is_group_gift": item.is_group_gift,
-            "created_at": item.created_at,
-            "updated_at": item.updated_at,
-        }
+    async def respond(session: AsyncSession, wishlist: Optional[Wishlist]) -> Response:
+        if not wishlist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Wishlist not found"
+            )
         
-        if is_owner:
-            # Owner view: only status, no names/amounts
-            if item.is_group_gift:
-                # Get total contributions
-                contrib_result = await db.execute(
-                    select(func.coalesce(func.sum(Contribution.amount), 0)).where(
-                        Contribution.item_id == item.id
-                    )
-                )
-                total_contributions = contrib_result.scalar() or Decimal("0")
-                
-                if total_contributions >= item.price:
-                    item_data["status"] = "Collected"
-                else:
-                    item_data["status"] = "Collecting"
-                item_data["is_reserved"] = False
-            else:
-                # Check if reserved
-                res_result = await db.execute(
-                    select(Reservation).where(Reservation.item_id == item.id)
-                )
-                reservation = res_result.scalar_one_or_none()
-                item_data["is_reserved"] = reservation is not None
-                item_data["status"] = "Reserved" if reservation else None
-        else:
-            # Public view: detailed info
-            if item.is_group_gift:
-                # Get contributions with names
-                contrib_result = await db.execute(
-                    select(Contribution).where(Contribution.item_id == item.id).order_by(Contribution.created_at)
-                )
-                contributions = contrib_result.scalars().all()
-                
-                total_contributions = sum(c.amount for c in contributions) or Decimal("0")
-                
-                item_data["total_contributions"] = total_contributions
-                item_data["contributions"] = [
-                    ContributionInfo(
-                        name=c.guest_name or (f"User {str(c.user_id)[:8]}" if c.user_id else "Anonymous"),
-                        amount=c.amount
-                    )
-                    for c in contributions
-                ]
-                item_data["reserved_by"] = None
-            else:
-                # Check reservation
-                res_result = await db.execute(
-                    select(Reservation).where(Reservation.item_id == item.id)
-                )
-                reservation = res_result.scalar_one_or_none()
-                
-                if reservation:
-                    item_data["reserved_by"] = reservation.guest_name or (f"User {str(reservation.user_id)[:8]}" if reservation.user_id else "Anonymous")
-                else:
-                    item_data["reserved_by"] = None
-                item_data["total_contributions"] = None
-                item_data["contributions"] = None
+        # Check if current user is owner
+        is_owner = bool(current_user and wishlist.owner_id == current_user.id)
         
-        item_responses.append(ItemResponse(**item_data))
-    
-    wishlist_dict = {
-        "id": wishlist.id,
-        "slug": wishlist.slug,
-        "title": wishlist.title,
-        "description": wishlist.description,
-        "created_at": wishlist.created_at,
-        "updated_at": wishlist.updated_at,
-        "items": item_responses,
-    }
+        etag = make_etag(wishlist.id, wishlist.version, "owner" if is_owner else "public")
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        # Only full, unpaginated responses are cached
+        paginated = limit is not None or cursor is not None
+        payload = None if paginated else wishlist_cache.lookup(slug, is_owner, wishlist.version)
+        if payload is None:
+            wishlist_response = await load_wishlist_view(session, wishlist, is_owner, limit, cursor)
+            payload = wishlist_response.model_dump_json().encode()
+            if not paginated:
+                wishlist_cache.store(slug, is_owner, wishlist.version, payload)
+        
+        return Response(content=payload, media_type="application/json", headers=headers)
     
-    if is_owner:
-        wishlist_dict["owner_id"] = wishlist.owner_id
-        return WishlistResponse(**wishlist_dict)
-    else:
-        return WishlistPublicResponse(**wishlist_dict)
+    wishlist = await find_wishlist(db)
+    # A replica that is behind may also not have the wishlist at all yet
+    if read_guard.replica_is_behind(db, wishlist.version if wishlist else None, min_version):
+        await release_db(db)
+        async with AsyncSessionLocal() as primary:
+            return await respond(primary, await find_wishlist(primary))
+    return await respond(db, wishlist)
 
 
 @router.put("/{slug}", response_model=WishlistResponse)
 async def update_wishlist(
     slug: str,
     wishlist_data: WishlistUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a wishlist (owner only)."""
-    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug))
+    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None)))
     wishlist = result.scalar_one_or_none()
     
     if not wishlist:
@@ -277,75 +212,33 @@ async def update_wishlist(
     if wishlist_data.description is not None:
         wishlist.description = wishlist_data.description
     
+    await bump_wishlist_version(db, wishlist.id)
     await db.commit()
     await db.refresh(wishlist)
+    wishlist_cache.invalidate(slug)
     
-    # Load items for response (owner view)
-    items_result = await db.execute(
-        select(Item).where(Item.wishlist_id == wishlist.id).order_by(Item.created_at.desc())
-    )
-    items = items_result.scalars().all()
-    
-    # Build item responses
-    item_responses = []
-    for item in items:
-        item_data = {
-            "id": item.id,
-            "wishlist_id": item.wishlist_id,
-            "title": item.title,
-            "url": item.url,
-            "price": item.price,
-            "image_url": item.image_url,
-            "is_group_gift": item.is_group_gift,
-            "created_at": item.created_at,
-            "updated_at": item.updated_at,
-        }
-        
-        if item.is_group_gift:
-            contrib_result = await db.execute(
-                select(func.coalesce(func.sum(Contribution.amount), 0)).where(
-                    Contribution.item_id == item.id
-                )
-            )
-            total_contributions = contrib_result.scalar() or Decimal("0")
-            if total_contributions >= item.price:
-                item_data["status"] = "Collected"
-            else:
-                item_data["status"] = "Collecting"
-            item_data["is_reserved"] = False
-        else:
-            res_result = await db.execute(
-                select(Reservation).where(Reservation.item_id == item.id)
-            )
-            reservation = res_result.scalar_one_or_none()
-            item_data["is_reserved"] = reservation is not None
-            item_data["status"] = "Reserved" if reservation else None
-        
-        item_responses.append(ItemResponse(**item_data))
-    
-    wishlist_dict = {
-        "id": wishlist.id,
-        "slug": wishlist.slug,
-        "title": wishlist.title,
-        "description": wishlist.description,
-        "owner_id": wishlist.owner_id,
-        "created_at": wishlist.created_at,
-        "updated_at": wishlist.updated_at,
-        "items": item_responses,
-    }
-    
-    return WishlistResponse(**wishlist_dict)
+    return await load_wishlist_view(db, wishlist, is_owner=True)
 
 
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_wishlist(
     slug: str,
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete a wishlist (owner only)."""
-    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug))
-    wishlist = result.scalar_one_or_none()
+    """Delete a wishlist (owner only).
+    
+    Small wishlists are deleted with one statement and the database cascades
+    to items, reservations and contributions. Wishlists with more than
+    WISHLIST_PURGE_THRESHOLD items are hidden right away with deleted_at and
+    purged in batches after the response. Room subscribers get a
+    ``wishlist_deleted`` message either way.
+    """
+    result = await db.execute(
+        select(Wishlist.id, Wishlist.owner_id).where(Wishlist.slug == slug, Wishlist.deleted_at.is_(None))
+    )
+    wishlist = result.one_or_none()
     
     if not wishlist:
         raise HTTPException(
@@ -359,8 +252,19 @@ async def delete_wishlist(
             detail="Not authorized to delete this wishlist"
         )
     
-    await db.delete(wishlist)
+    if await has_many_items(db, wishlist.id):
+        await db.execute(
+            update(Wishlist)
+            .where(Wishlist.id == wishlist.id)
+            .values(deleted_at=func.now(), version=Wishlist.version + 1)
+        )
+        background_tasks.add_task(purge_wishlist_in_background, wishlist.id)
+    else:
+        await delete_wishlist_now(db, wishlist.id)
     await db.commit()
     
+    wishlist_cache.invalidate(slug)
+    await ws_manager.broadcast_wishlist_deleted(slug)
+    
     return None
 
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import time
+from app.core.config import settings
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        """Return a live entry and mark it as recently used, without counting."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a cached value or None, counting the hit or miss."""
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries over the bound."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Drop an entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+class WishlistResponseCache(TTLCache):
+    """Serialized wishlist responses keyed by (slug, view).
+
+    The view is "owner" or "public". Each entry remembers the wishlist version
+    it was rendered at, so a response from before a change made through
+    another worker is never served.
+    """
+
+    VIEWS = ("owner", "public")
+
+    def lookup(self, slug: str, is_owner: bool, version: int) -> Optional[bytes]:
+        """Return the cached JSON body for a view if it is at the current version."""
+        entry = self._get((slug, "owner" if is_owner else "public"))
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def store(self, slug: str, is_owner: bool, version: int, payload: bytes):
+        self.set((slug, "owner" if is_owner else "public"), (version, payload))
+
+    def invalidate(self, slug: str):
+        """Drop every view of a wishlist after it, its items, reservations or contributions change."""
+        for view in self.VIEWS:
+            self.pop((slug, view))
+
+
+# Global rendered wishlist cache instance
+wishlist_cache = WishlistResponseCache(
+    max_entries=settings.WISHLIST_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.WISHLIST_CACHE_TTL_SECONDS,
+)
+
+
+# Authenticated principals (CurrentUser) keyed by user id. Session commits
+# invalidate them (see app.api.deps); Core updates to users outside a session
+# must call principal_cache.pop themselves.
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
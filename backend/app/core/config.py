@@ -1,5 +1,6 @@
 from typing import List
 from pathlib import Path
+from urllib.parse import urlparse
 import os
 from dotenv import load_dotenv
 
@@ -20,6 +21,39 @@ else:
     load_dotenv(override=True)
 
 
+# Профили пула соединений с БД (DB_POOL_PROFILE)
+DB_POOL_PROFILES = {
+    # Постоянный процесс с прямым подключением к Postgres
+    "direct": {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache": True,
+    },
+    # pgbouncer / Supabase pooler в transaction mode (порт 6543): серверное
+    # соединение меняется между транзакциями, prepared statements не переживают
+    "pgbouncer-transaction": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+        "statement_cache": False,
+    },
+    # Короткоживущие процессы: без пула, новое соединение на каждый checkout
+    "serverless": {
+        "pool_size": 0,
+        "max_overflow": 0,
+        "pool_timeout": 10,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_cache": False,
+    },
+}
+
+
 class Settings:
     """Настройки приложения."""
     
@@ -27,6 +61,32 @@ class Settings:
         # Database
         self.DATABASE_URL: str = os.getenv("DATABASE_URL", "")
         
+        # Read replica for read-only endpoints (optional). After a write the same
+        # signed-in user reads from the primary for READ_STICKY_SECONDS.
+        self.READ_DATABASE_URL: str = os.getenv("READ_DATABASE_URL", "")
+        self.READ_STICKY_SECONDS: float = float(os.getenv("READ_STICKY_SECONDS", "5"))
+        
+        # Database pool: auto picks pgbouncer-transaction for port 6543, otherwise direct.
+        # DB_POOL_* variables override single values of the profile.
+        self.DB_POOL_PROFILE: str = os.getenv("DB_POOL_PROFILE", "auto")
+        self.DB_POOL_SIZE: str | None = os.getenv("DB_POOL_SIZE") or None
+        self.DB_MAX_OVERFLOW: str | None = os.getenv("DB_MAX_OVERFLOW") or None
+        self.DB_POOL_TIMEOUT: str | None = os.getenv("DB_POOL_TIMEOUT") or None
+        self.DB_POOL_RECYCLE: str | None = os.getenv("DB_POOL_RECYCLE") or None
+        self.DB_POOL_PRE_PING: str | None = os.getenv("DB_POOL_PRE_PING") or None
+        # require (encrypted, certificate not checked), verify-full or disable
+        self.DB_SSL: str = os.getenv("DB_SSL", "require")
+        
+        # Schema on startup: check only compares the Alembic revision (run
+        # `alembic upgrade head` to migrate); create runs create_all and the
+        # legacy ALTER TABLEs on every boot, for throwaway dev databases.
+        self.DB_SCHEMA_MODE: str = os.getenv("DB_SCHEMA_MODE", "check")
+        
+        # Wishlists with more items than this are soft-deleted and purged in
+        # the background, WISHLIST_PURGE_BATCH_SIZE items per transaction
+        self.WISHLIST_PURGE_THRESHOLD: int = int(os.getenv("WISHLIST_PURGE_THRESHOLD", "500"))
+        self.WISHLIST_PURGE_BATCH_SIZE: int = int(os.getenv("WISHLIST_PURGE_BATCH_SIZE", "1000"))
+        
         # Security
         self.SECRET_KEY: str = os.getenv("SECRET_KEY", "")
         self.ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
@@ -44,6 +104,32 @@ class Settings:
         
         # WebSocket
         self.WS_HEARTBEAT_INTERVAL: int = int(os.getenv("WS_HEARTBEAT_INTERVAL", "30"))
+        # Outbound messages buffered per connection; a client that falls this
+        # far behind, or blocks one send for WS_SEND_TIMEOUT seconds, is dropped
+        self.WS_SEND_QUEUE_SIZE: int = int(os.getenv("WS_SEND_QUEUE_SIZE", "32"))
+        self.WS_SEND_TIMEOUT: float = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+        
+        # Rendered wishlist cache (per process)
+        self.WISHLIST_CACHE_MAX_ENTRIES: int = int(os.getenv("WISHLIST_CACHE_MAX_ENTRIES", "1000"))
+        self.WISHLIST_CACHE_TTL_SECONDS: float = float(os.getenv("WISHLIST_CACHE_TTL_SECONDS", "30"))
+        
+        # Authenticated principal cache (per process)
+        self.PRINCIPAL_CACHE_MAX_ENTRIES: int = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+        self.PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+        
+        # Bulk item creation
+        self.ITEM_BATCH_MAX_SIZE: int = int(os.getenv("ITEM_BATCH_MAX_SIZE", "500"))
+        
+        # Streaming item import
+        self.IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "200"))
+        self.IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "100"))
+        # Longest CSV record a quoted value may stretch over several lines
+        self.IMPORT_MAX_RECORD_CHARS: int = int(os.getenv("IMPORT_MAX_RECORD_CHARS", "65536"))
+        self.IMPORT_AUTOFILL_MAX_ROWS: int = int(os.getenv("IMPORT_AUTOFILL_MAX_ROWS", "200"))
+        self.IMPORT_AUTOFILL_CONCURRENCY: int = int(os.getenv("IMPORT_AUTOFILL_CONCURRENCY", "4"))
+        
+        # Password hashing (bcrypt threads per process)
+        self.PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
         
         # Валидация обязательных полей
         if not self.DATABASE_URL:
@@ -51,6 +137,34 @@ class Settings:
         if not self.SECRET_KEY:
             raise ValueError("SECRET_KEY is required")
     
+    @property
+    def db_pool_profile(self) -> str:
+        profile = self.DB_POOL_PROFILE
+        if profile == "auto":
+            try:
+                port = urlparse(self.DATABASE_URL).port
+            except ValueError:
+                port = None
+            profile = "pgbouncer-transaction" if port == 6543 else "direct"
+        if profile not in DB_POOL_PROFILES:
+            raise ValueError(f"Unknown DB_POOL_PROFILE: {profile}. Use auto, {', '.join(DB_POOL_PROFILES)}")
+        return profile
+    
+    @property
+    def db_pool_options(self) -> dict:
+        """Pool options of the selected profile with DB_POOL_* overrides applied."""
+        options = dict(DB_POOL_PROFILES[self.db_pool_profile])
+        for key, value, cast in (
+            ("pool_size", self.DB_POOL_SIZE, int),
+            ("max_overflow", self.DB_MAX_OVERFLOW, int),
+            ("pool_timeout", self.DB_POOL_TIMEOUT, float),
+            ("pool_recycle", self.DB_POOL_RECYCLE, int),
+            ("pool_pre_ping", self.DB_POOL_PRE_PING, lambda v: v.lower() in ("1", "true", "yes")),
+        ):
+            if value is not None:
+                options[key] = cast(value)
+        return options
+    
     @property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
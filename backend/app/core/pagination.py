@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any, Callable, Tuple
+import base64
+import binascii
+from fastapi import HTTPException, status
+
+# Upper bound for the ``limit`` query parameter of paginated endpoints
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque token."""
+    raw = ",".join(value.isoformat() if isinstance(value, datetime) else str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> Tuple[Any, ...]:
+    """Decode a token produced by encode_cursor, parsing each part in order.
+
+    Example: ``decode_cursor(after, datetime.fromisoformat, UUID)``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split(",")
+        if len(parts) != len(parsers):
+            raise ValueError("unexpected number of cursor parts")
+        return tuple(parse(part) for parse, part in zip(parsers, parts))
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
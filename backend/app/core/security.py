@@ -1,9 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 from jose import JWTError, jwt
+import asyncio
 import bcrypt
+import threading
+import time
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 def _truncate_to_bytes(password: str, max_bytes: int = 72) -> bytes:
     """Truncate password to max_bytes (bcrypt limit is 72 bytes)."""
@@ -38,6 +44,81 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+class PasswordHashPool:
+    """Bounded thread pool that keeps bcrypt off the event loop.
+    
+    bcrypt releases the GIL while hashing, so a few threads are enough to
+    keep other requests and WebSockets responsive during a login spike.
+    Tracks how many operations wait for a worker so the pool can be sized.
+    """
+    
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queued = 0
+        self.completed = 0
+        self._wait_seconds = 0.0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+    
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run a blocking password function on the pool and await its result."""
+        submitted_at = time.monotonic()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        
+        def call() -> T:
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+                self._wait_seconds += time.monotonic() - submitted_at
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+        
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "avg_wait_ms": round(self._wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+
+# Global password hashing pool
+password_pool = PasswordHashPool(workers=settings.PASSWORD_HASH_WORKERS)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool instead of the event loop."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password pool instead of the event loop."""
+    return await password_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
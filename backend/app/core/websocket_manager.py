@@ -2,53 +2,148 @@ from typing import Dict, Set
 from fastapi import WebSocket
 import json
 import asyncio
+import time
+from app.core.config import settings
+
+# Close code for dropped slow consumers: "try again later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class RoomConnection:
+    """A socket in a wishlist room with its bounded outbound queue."""
+
+    def __init__(self, websocket: WebSocket, slug: str, queue_size: int):
+        self.websocket = websocket
+        self.slug = slug
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task | None = None
 
 
 class WebSocketManager:
-    """Manages WebSocket connections grouped by wishlist slug."""
-    
-    def __init__(self):
-        # Map slug -> set of WebSocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-    
+    """Manages WebSocket connections grouped by wishlist slug.
+
+    Every connection has its own writer task draining a bounded queue, so a
+    broadcast only enqueues and never waits for a client. A connection whose
+    queue overflows, or whose send blocks for longer than the send timeout,
+    is closed and dropped; the client reconnects and refetches.
+    """
+
+    def __init__(self, queue_size: int = settings.WS_SEND_QUEUE_SIZE, send_timeout: float = settings.WS_SEND_TIMEOUT):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        # Map slug -> {websocket: connection}
+        self.active_connections: Dict[str, Dict[WebSocket, RoomConnection]] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self.broadcasts = 0
+        self.sent = 0
+        self.evicted_overflow = 0
+        self.evicted_timeout = 0
+
     async def connect(self, websocket: WebSocket, slug: str):
         """Connect a WebSocket to a wishlist room."""
         await websocket.accept()
-        if slug not in self.active_connections:
-            self.active_connections[slug] = set()
-        self.active_connections[slug].add(websocket)
-    
+        connection = RoomConnection(websocket, slug, self.queue_size)
+        connection.writer = asyncio.create_task(self._write(connection))
+        self.active_connections.setdefault(slug, {})[websocket] = connection
+
     def disconnect(self, websocket: WebSocket, slug: str):
         """Remove a WebSocket from a wishlist room."""
-        if slug in self.active_connections:
-            self.active_connections[slug].discard(websocket)
-            if not self.active_connections[slug]:
-                del self.active_connections[slug]
-    
+        room = self.active_connections.get(slug)
+        if room is None:
+            return
+        connection = room.pop(websocket, None)
+        if not room:
+            del self.active_connections[slug]
+        if connection is not None and connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+    async def _write(self, connection: RoomConnection):
+        """Send queued messages to one client in order."""
+        try:
+            while True:
+                payload = await connection.queue.get()
+                # asyncio.timeout, unlike wait_for, does not wrap every send in a task
+                async with asyncio.timeout(self.send_timeout):
+                    await connection.websocket.send_text(payload)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.evicted_timeout += 1
+            self._evict(connection)
+        except Exception:
+            # Client went away; the endpoint's receive loop sees it too
+            self.disconnect(connection.websocket, connection.slug)
+
+    def _evict(self, connection: RoomConnection):
+        """Drop a slow consumer and close its socket in the background."""
+        self.disconnect(connection.websocket, connection.slug)
+        task = asyncio.create_task(self._close(connection.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(code=SLOW_CONSUMER_CLOSE_CODE), timeout=self.send_timeout)
+        except Exception:
+            pass
+
     async def broadcast_to_room(self, slug: str, message: dict):
-        """Broadcast a message to all connections in a room."""
-        if slug not in self.active_connections:
+        """Broadcast a message to all connections in a room.
+
+        The message is serialized once and put on every connection's queue
+        without waiting for any client. Messages carry ``sent_at`` (server
+        epoch seconds) so clients such as scripts.loadtest can measure
+        fan-out delay.
+        """
+        room = self.active_connections.get(slug)
+        if not room:
             return
-        
-        disconnected = set()
-        for connection in self.active_connections[slug]:
+
+        self.broadcasts += 1
+        payload = json.dumps({**message, "sent_at": time.time()})
+        overflowed = []
+        for connection in room.values():
             try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.add(connection)
-        
-        # Clean up disconnected connections
-        for conn in disconnected:
-            self.disconnect(conn, slug)
-    
-    async def broadcast_wishlist_update(self, slug: str):
-        """Broadcast a wishlist update event."""
+                connection.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                overflowed.append(connection)
+
+        for connection in overflowed:
+            self.evicted_overflow += 1
+            self._evict(connection)
+
+    async def broadcast_wishlist_update(self, slug: str, version: int):
+        """Broadcast a wishlist update event.
+
+        Carries the new wishlist version; clients pass it back as
+        ``min_version`` when they refetch so a lagging replica is skipped.
+        """
         await self.broadcast_to_room(slug, {
             "type": "wishlist_updated",
+            "slug": slug,
+            "version": version
+        })
+
+    async def broadcast_wishlist_deleted(self, slug: str):
+        """Broadcast that a wishlist was deleted."""
+        await self.broadcast_to_room(slug, {
+            "type": "wishlist_deleted",
             "slug": slug
         })
 
+    def stats(self) -> dict:
+        connections = [connection for room in self.active_connections.values() for connection in room.values()]
+        return {
+            "rooms": len(self.active_connections),
+            "connections": len(connections),
+            "queued": sum(connection.queue.qsize() for connection in connections),
+            "broadcasts": self.broadcasts,
+            "sent": self.sent,
+            "evicted_overflow": self.evicted_overflow,
+            "evicted_timeout": self.evicted_timeout,
+        }
+
 
 # Global WebSocket manager instance
 ws_manager = WebSocketManager()
-
@@ -1,30 +1,73 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
 import ssl
+import uuid
 
-# Настройка SSL для asyncpg
-# Убираем sslmode из URL и настраиваем через connect_args
-database_url = settings.DATABASE_URL
-if "?sslmode=" in database_url:
-    database_url = database_url.split("?sslmode=")[0]
-elif "&sslmode=" in database_url:
-    database_url = database_url.split("&sslmode=")[0]
 
-# Создаем SSL контекст
-ssl_context = ssl.create_default_context()
-ssl_context.check_hostname = False
-ssl_context.verify_mode = ssl.CERT_NONE
+def _strip_sslmode(url: str) -> str:
+    """Убираем sslmode из URL, SSL настраивается через connect_args."""
+    if "?sslmode=" in url:
+        return url.split("?sslmode=")[0]
+    if "&sslmode=" in url:
+        return url.split("&sslmode=")[0]
+    return url
+
+
+def _ssl_arg():
+    """SSL: require — шифрование без проверки сертификата (как раньше), verify-full — с проверкой."""
+    if settings.DB_SSL == "disable":
+        return False
+    context = ssl.create_default_context()
+    if settings.DB_SSL != "verify-full":
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+db_pool_profile = settings.db_pool_profile
+pool_options = settings.db_pool_options
+
+
+def create_engine_for(url: str, pool_name: str):
+    """Async engine for one database with the configured pool profile."""
+    connect_args = {"ssl": _ssl_arg()}
+    engine_args = {}
+    if not pool_options["statement_cache"]:
+        # pgbouncer in transaction mode hands each transaction a different server
+        # connection, so prepared statements must not be cached or reused by name
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    if db_pool_profile == "serverless":
+        engine_args["poolclass"] = NullPool
+    else:
+        engine_args.update(
+            poolclass=InstrumentedQueuePool.with_metrics(pool_name),
+            pool_size=pool_options["pool_size"],
+            max_overflow=pool_options["max_overflow"],
+            pool_timeout=pool_options["pool_timeout"],
+            pool_recycle=pool_options["pool_recycle"],
+            pool_pre_ping=pool_options["pool_pre_ping"],
+        )
+
+    return create_async_engine(
+        _strip_sslmode(url),
+        echo=False,
+        future=True,
+        connect_args=connect_args,
+        **engine_args,
+    )
+
 
 # Create async engine
-engine = create_async_engine(
-    database_url,
-    echo=False,
-    future=True,
-    connect_args={
-        "ssl": ssl_context
-    }
-)
+engine = create_engine_for(settings.DATABASE_URL, "PrimaryQueuePool")
+
+# Read replica engine; without READ_DATABASE_URL reads go to the primary
+read_engine = create_engine_for(settings.READ_DATABASE_URL, "ReplicaQueuePool") if settings.READ_DATABASE_URL else None
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -35,6 +78,15 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Session factory for read-only handlers (see app.db.session.get_read_db)
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+) if read_engine is not None else AsyncSessionLocal
+
 # Base class for models
 Base = declarative_base()
 
@@ -0,0 +1,22 @@
+from sqlalchemy import event
+from app.db.base import engine
+
+
+class QueryCounter:
+    """Count SQL statements sent to the database while the context is active."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        return False
@@ -0,0 +1,23 @@
+from pathlib import Path
+from typing import Optional
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def head_revision() -> Optional[str]:
+    """Latest revision in backend/alembic/versions, read from disk."""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+async def current_revision(conn: AsyncConnection) -> Optional[str]:
+    """Revision the database is stamped with, None if it was never migrated."""
+    table = (await conn.execute(text("SELECT to_regclass('alembic_version')"))).scalar()
+    if table is None:
+        return None
+    return (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Boolean, DateTime, Enum
+from sqlalchemy import Column, ForeignKey, Boolean, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -20,6 +20,9 @@ class Friendship(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     requester_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     addressee_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Canonical ordered pair, so both directions of a friendship share one row
+    user_low = Column(UUID(as_uuid=True), nullable=False)
+    user_high = Column(UUID(as_uuid=True), nullable=False)
     status = Column(Enum(FriendshipStatus), default=FriendshipStatus.PENDING, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -28,6 +31,19 @@ class Friendship(Base):
     requester = relationship("User", foreign_keys=[requester_id], backref="sent_friendships")
     addressee = relationship("User", foreign_keys=[addressee_id], backref="received_friendships")
 
+    # One row per pair; status is included so are-friends checks are index-only
+    __table_args__ = (
+        Index('uq_friendships_pair', 'user_low', 'user_high', unique=True, postgresql_include=['status']),
+        Index('idx_friendships_user_high_status', 'user_high', 'status'),
+        Index('idx_friendships_requester_status', 'requester_id', 'status'),
+        Index('idx_friendships_addressee_status', 'addressee_id', 'status'),
+    )
+
+    @staticmethod
+    def canonical_pair(user_a, user_b):
+        """Order two user ids the way they are stored in user_low/user_high."""
+        return (user_a, user_b) if user_a < user_b else (user_b, user_a)
+
     def __repr__(self):
         return f"<Friendship {self.requester_id} -> {self.addressee_id} ({self.status.value})>"
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Numeric, Integer, Boolean, DateTime, ForeignKey, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -15,12 +15,19 @@ class Item(Base):
     price = Column(Numeric(10, 2), nullable=False)
     image_url = Column(String, nullable=True)
     is_group_gift = Column(Boolean, default=False, nullable=False)
+    # Running totals of contributions, maintained in the contribution transaction
+    funded_amount = Column(Numeric(10, 2), default=0, server_default="0", nullable=False)
+    contribution_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     wishlist = relationship("Wishlist", back_populates="items")
-    reservation = relationship("Reservation", back_populates="item", uselist=False, cascade="all, delete-orphan")
-    contributions = relationship("Contribution", back_populates="item", cascade="all, delete-orphan")
-
+    reservation = relationship("Reservation", back_populates="item", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    contributions = relationship("Contribution", back_populates="item", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Keyset pagination of a wishlist's items, newest first
+    __table_args__ = (
+        Index('idx_items_wishlist_created_at_id', wishlist_id, created_at.desc(), id.desc()),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Date, Text, func
+from sqlalchemy import Column, String, DateTime, Date, Text, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -25,4 +25,24 @@ class User(Base):
     
     # Relationships
     wishlists = relationship("Wishlist", back_populates="owner", cascade="all, delete-orphan")
-
+    
+    # User search: prefix lookups on email, trigram substring matches on email and name
+    __table_args__ = (
+        Index(
+            'idx_users_email_lower_prefix',
+            func.lower(email).label('email_lower_prefix'),
+            postgresql_ops={'email_lower_prefix': 'text_pattern_ops'},
+        ),
+        Index(
+            'idx_users_email_lower_trgm',
+            func.lower(email).label('email_lower_trgm'),
+            postgresql_using='gin',
+            postgresql_ops={'email_lower_trgm': 'gin_trgm_ops'},
+        ),
+        Index(
+            'idx_users_full_name_trgm',
+            full_name,
+            postgresql_using='gin',
+            postgresql_ops={'full_name': 'gin_trgm_ops'},
+        ),
+    )
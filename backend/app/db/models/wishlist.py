@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -13,10 +13,20 @@ class Wishlist(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Bumped on every change to the wishlist, its items, reservations or contributions
+    version = Column(Integer, default=1, server_default="1", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set when a large wishlist is deleted; its rows are purged in the background
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     owner = relationship("User", back_populates="wishlists")
-    items = relationship("Item", back_populates="wishlist", cascade="all, delete-orphan")
-
+    # Items, reservations and contributions are removed by ON DELETE CASCADE in
+    # the database; passive_deletes keeps the ORM from loading them to delete
+    items = relationship("Item", back_populates="wishlist", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Lets the purge sweep find soft-deleted wishlists without scanning live ones
+    __table_args__ = (
+        Index('idx_wishlists_deleted_at', deleted_at, postgresql_where=deleted_at.isnot(None)),
+    )
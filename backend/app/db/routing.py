@@ -0,0 +1,85 @@
+from typing import Optional
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.base import read_engine
+
+# Methods that can write; a successful one pins its caller to the primary
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class ReadYourWritesGuard:
+    """Remembers who wrote recently so their reads skip the replica.
+
+    Callers are identified by the user id in their bearer token. Guests are
+    not tracked: client IPs are shared behind proxies and the first
+    X-Forwarded-For hop can be spoofed, so one guest write would pin many
+    readers to the primary. Guests get their own change back through
+    ``min_version`` instead; see ``replica_is_behind``. State is per process,
+    which matches the single uvicorn process the app is deployed as.
+    """
+
+    def __init__(self, sticky_seconds: float, enabled: bool):
+        self.enabled = enabled
+        self._recent_writers = TTLCache(max_entries=100_000, ttl_seconds=sticky_seconds)
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self.lagging_reads = 0
+
+    @staticmethod
+    def _user_id(request: Request) -> Optional[str]:
+        authorization = request.headers.get("authorization", "")
+        if not authorization.lower().startswith("bearer "):
+            return None
+        payload = decode_access_token(authorization[7:])
+        return str(payload["sub"]) if payload and payload.get("sub") else None
+
+    def mark_write(self, request: Request):
+        if not self.enabled:
+            return
+        user_id = self._user_id(request)
+        if user_id:
+            self._recent_writers.set(user_id, True)
+
+    def use_replica(self, request: Request) -> bool:
+        """Whether this read may go to the replica, counting the decision."""
+        if not self.enabled:
+            return False
+        user_id = self._user_id(request)
+        if user_id and self._recent_writers.get(user_id):
+            self.primary_reads += 1
+            return False
+        self.replica_reads += 1
+        return True
+
+    def replica_is_behind(self, db: AsyncSession, version: Optional[int], min_version: Optional[int]) -> bool:
+        """Whether a wishlist version read from the replica predates one the client has seen.
+
+        Clients learn the new version from the wishlist_updated broadcast, or
+        from the X-Wishlist-Version header of their own reservation or
+        contribution, and send it back as ``min_version``; an older replica
+        row, or none at all (``version`` None), means the read has to be
+        repeated on the primary.
+        """
+        if min_version is None or db.bind is not read_engine:
+            return False
+        if version is not None and version >= min_version:
+            return False
+        self.lagging_reads += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sticky_seconds": settings.READ_STICKY_SECONDS,
+            "replica_reads": self.replica_reads,
+            "sticky_primary_reads": self.primary_reads,
+            "lagging_primary_reads": self.lagging_reads,
+            "recent_writers": self._recent_writers.stats()["size"],
+        }
+
+
+# Global read routing guard
+read_guard = ReadYourWritesGuard(settings.READ_STICKY_SECONDS, enabled=read_engine is not None)
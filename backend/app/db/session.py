@@ -1,12 +1,46 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.base import AsyncSessionLocal
+from app.db.base import AsyncSessionLocal, ReadSessionLocal
+from app.db.routing import read_guard
 
 
 async def get_db() -> AsyncSession:
-    """Dependency to get database session."""
+    """Dependency to get database session.
+    
+    The session is lazy: it checks a connection out of the pool on its first
+    statement, not here, and hands it back on commit, rollback or close, so
+    a route that never queries never touches the pool.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
 
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Dependency for read-only handlers: a session on the read replica.
+    
+    Falls back to the primary when no READ_DATABASE_URL is configured, or
+    when the signed-in caller wrote within READ_STICKY_SECONDS, so users
+    always see their own changes despite replication lag; guests pass
+    min_version instead. Never write through it.
+    """
+    session_factory = ReadSessionLocal if read_guard.use_replica(request) else AsyncSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def release_db(db: AsyncSession):
+    """Give the session's connection back to the pool before slow non-database work.
+    
+    Commit already returns the connection, so this is only needed while the
+    session still holds one: after a read or a refresh, e.g. before streaming
+    an upload or a WebSocket broadcast. Anything not yet committed is rolled
+    back. Loaded objects stay readable and the session checks out a new
+    connection if it is used again.
+    """
+    await db.close()
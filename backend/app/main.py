@@ -5,7 +5,12 @@ from starlette.middleware.sessions import SessionMiddleware
 from app.core.config import settings
 from app.api.endpoints import auth, wishlists, items, reservations, contributions, autofill, friends, profile
 from app.core.websocket_manager import ws_manager
-from app.db.base import engine, Base
+from app.core.cache import wishlist_cache, principal_cache
+from app.core.security import password_pool
+from app.db.base import engine, read_engine, Base, db_pool_profile
+from app.db.migrations import head_revision, current_revision
+from app.db.pool import pool_stats
+from app.db.routing import read_guard, UNSAFE_METHODS
 from app.db.models import User, Wishlist, Item, Reservation, Contribution, Friendship
 import asyncio
 
@@ -63,6 +68,16 @@ async def handle_options(request: Request, call_next):
     print(f"📤 Response: {response.status_code}")
     return response
 
+
+@app.middleware("http")
+async def stick_writers_to_primary(request: Request, call_next):
+    """After a successful write, route the signed-in caller's reads to the primary for a while."""
+    response = await call_next(request)
+    if request.method in UNSAFE_METHODS and response.status_code < 400:
+        read_guard.mark_write(request)
+    return response
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(wishlists.router, prefix="/api/wishlists", tags=["wishlists"])
@@ -84,43 +99,103 @@ async def websocket_endpoint(websocket: WebSocket, slug: str):
             data = await websocket.receive_text()
             # Echo back or ignore (server only pushes updates)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also covers sockets closed by the manager as slow consumers
         ws_manager.disconnect(websocket, slug)
 
 
+async def create_schema():
+    """Create tables and apply the legacy ALTER TABLEs (DB_SCHEMA_MODE=create)."""
+    from sqlalchemy import text
+    # User search indexes need pg_trgm
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+    except Exception as e:
+        print(f"⚠️  Could not enable pg_trgm (user search indexes need it): {e}")
+    
+    # Create tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    print("✅ Database tables created/verified!")
+    
+    # Add new columns to users table if they don't exist
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("""
+                ALTER TABLE users 
+                ADD COLUMN IF NOT EXISTS bio TEXT,
+                ADD COLUMN IF NOT EXISTS birthday DATE,
+                ADD COLUMN IF NOT EXISTS location VARCHAR(255),
+                ADD COLUMN IF NOT EXISTS phone VARCHAR(50),
+                ADD COLUMN IF NOT EXISTS website VARCHAR(255),
+                ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE;
+            """))
+            await conn.execute(text("""
+                UPDATE users SET updated_at = created_at WHERE updated_at IS NULL;
+            """))
+        print("✅ User profile columns added/verified!")
+    except Exception as e:
+        print(f"⚠️  Could not add profile columns (may already exist): {e}")
+    
+    # Add running funding totals to items table if they don't exist
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("""
+                ALTER TABLE items
+                ADD COLUMN IF NOT EXISTS funded_amount NUMERIC(10, 2) NOT NULL DEFAULT 0,
+                ADD COLUMN IF NOT EXISTS contribution_count INTEGER NOT NULL DEFAULT 0;
+            """))
+        print("✅ Item funding columns added/verified!")
+    except Exception as e:
+        print(f"⚠️  Could not add item funding columns (may already exist): {e}")
+    
+    # Add version counter to wishlists table if it doesn't exist
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("""
+                ALTER TABLE wishlists
+                ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1,
+                ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE;
+            """))
+        print("✅ Wishlist version and deleted_at columns added/verified!")
+    except Exception as e:
+        print(f"⚠️  Could not add wishlist columns (may already exist): {e}")
+
+
+async def check_schema():
+    """Compare the database revision with the Alembic head (DB_SCHEMA_MODE=check).
+    
+    One round trip on an already-migrated database; nothing is locked or
+    rewritten, so every worker can run it on boot.
+    """
+    head = head_revision()
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+    if current == head:
+        print(f"✅ Database schema is at revision {current}")
+    elif current is None:
+        print("⚠️  Database has no schema revision. Run `alembic upgrade head`")
+        print("   (or set DB_SCHEMA_MODE=create for a throwaway dev database)")
+    else:
+        print(f"⚠️  Database schema is at revision {current}, code expects {head}. Run `alembic upgrade head`")
+
+
 @app.on_event("startup")
 async def startup():
-    """Initialize database on startup."""
+    """Check (or create, in DB_SCHEMA_MODE=create) the database schema on startup."""
     try:
-        # Test connection first
-        from sqlalchemy import text
-        async with engine.connect() as conn:
-            result = await conn.execute(text("SELECT 1"))
-            result.fetchone()
-        print("✅ Database connection test successful!")
-        
-        # Create tables
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        print("✅ Database tables created/verified!")
-        
-        # Add new columns to users table if they don't exist
-        try:
-            async with engine.begin() as conn:
-                await conn.execute(text("""
-                    ALTER TABLE users 
-                    ADD COLUMN IF NOT EXISTS bio TEXT,
-                    ADD COLUMN IF NOT EXISTS birthday DATE,
-                    ADD COLUMN IF NOT EXISTS location VARCHAR(255),
-                    ADD COLUMN IF NOT EXISTS phone VARCHAR(50),
-                    ADD COLUMN IF NOT EXISTS website VARCHAR(255),
-                    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE;
-                """))
-                await conn.execute(text("""
-                    UPDATE users SET updated_at = created_at WHERE updated_at IS NULL;
-                """))
-            print("✅ User profile columns added/verified!")
-        except Exception as e:
-            print(f"⚠️  Could not add profile columns (may already exist): {e}")
+        if settings.DB_SCHEMA_MODE == "create":
+            # Test connection first
+            from sqlalchemy import text
+            async with engine.connect() as conn:
+                result = await conn.execute(text("SELECT 1"))
+                result.fetchone()
+            print("✅ Database connection test successful!")
+            await create_schema()
+        else:
+            await check_schema()
     except Exception as e:
         error_msg = str(e)
         print(f"\n❌ Database connection failed!")
@@ -136,6 +211,11 @@ async def startup():
         print("   You can test API endpoints, but they won't work without DB connection.\n")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    password_pool.shutdown()
+
+
 @app.get("/")
 async def root():
     return {"message": "Social Wishlist API", "version": "1.0.0"}
@@ -146,6 +226,22 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """In-process counters for sizing caches and pools."""
+    return {
+        "wishlist_cache": wishlist_cache.stats(),
+        "websockets": ws_manager.stats(),
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": password_pool.stats(),
+        "db_pool": pool_stats(engine, db_pool_profile),
+        "read_replica": {
+            **read_guard.stats(),
+            "db_pool": pool_stats(read_engine, db_pool_profile) if read_engine is not None else None,
+        },
+    }
+
+
 # Добавляем CORS заголовки к ошибкам
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
 
@@ -18,3 +18,19 @@ class ContributionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class ContributorSummary(BaseModel):
+    name: str
+    amount: Decimal
+    count: int
+
+
+class ContributionSummaryResponse(BaseModel):
+    item_id: UUID
+    price: Decimal
+    total: Decimal
+    count: int
+    remaining: Decimal
+    percent_funded: float
+    top_contributors: List[ContributorSummary] = []
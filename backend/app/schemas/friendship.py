@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List
 from app.db.models.friendship import FriendshipStatus
 
 
@@ -47,3 +47,13 @@ class FriendWishlistResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class FriendFeedWishlistResponse(FriendWishlistResponse):
+    owner_id: UUID
+    owner_name: Optional[str] = None
+
+
+class FriendFeedResponse(BaseModel):
+    wishlists: List[FriendFeedWishlistResponse] = []
+    next_cursor: Optional[str] = None  # pass back as ``after`` for the next page
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -51,3 +51,32 @@ class ItemResponse(ItemBase):
     class Config:
         from_attributes = True
 
+
+
+class ItemBatchCreate(BaseModel):
+    # Rows are validated one by one so a bad row can be reported by index
+    items: List[Dict[str, Any]]
+    partial: bool = False  # insert the valid rows even if some rows are invalid
+
+
+class ItemBatchError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class ItemBatchResponse(BaseModel):
+    created: List[ItemResponse]
+    errors: List[ItemBatchError] = []
+
+
+class ItemImportError(BaseModel):
+    line: int
+    errors: List[Dict[str, Any]]
+
+
+class ItemImportResponse(BaseModel):
+    processed: int
+    created: int
+    failed: int
+    autofill_queued: int = 0
+    errors: List[ItemImportError] = []  # first IMPORT_MAX_REPORTED_ERRORS failures
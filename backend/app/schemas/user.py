@@ -76,3 +76,26 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
 
+
+
+class CurrentUser(BaseModel):
+    """Authenticated principal resolved by get_current_user and cached per user.
+    
+    Carries the profile fields UserResponse needs, so handlers never have to
+    load the User row just to know who is calling.
+    """
+    id: UUID
+    email: str
+    full_name: Optional[str] = None
+    provider: str
+    avatar_url: Optional[str] = None
+    bio: Optional[str] = None
+    birthday: Optional[date] = None
+    location: Optional[str] = None
+    phone: Optional[str] = None
+    website: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
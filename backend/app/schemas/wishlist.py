@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
+from decimal import Decimal
 from app.schemas.item import ItemResponse
 
 
@@ -26,6 +27,7 @@ class WishlistResponse(WishlistBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     items: List[ItemResponse] = []
+    next_cursor: Optional[str] = None  # set when items are paginated and more remain
     
     class Config:
         from_attributes = True
@@ -36,7 +38,24 @@ class WishlistPublicResponse(WishlistBase):
     slug: str
     created_at: datetime
     items: List[ItemResponse] = []
+    next_cursor: Optional[str] = None  # set when items are paginated and more remain
     
     class Config:
         from_attributes = True
 
+
+
+class WishlistSummaryResponse(WishlistBase):
+    id: UUID
+    slug: str
+    owner_id: UUID
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    items_count: int = 0
+    reserved_count: int = 0
+    group_gifts_count: int = 0
+    funding_goal: Decimal = Decimal("0")  # sum of group gift prices
+    funded_total: Decimal = Decimal("0")  # sum of contributions to group gifts
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,84 @@
+import uuid
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select, insert, update, literal, cast, true
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.item import Item
+from app.db.models.wishlist import Wishlist
+from app.db.models.contribution import Contribution
+
+
+async def insert_contribution(
+    db: AsyncSession,
+    item_id: UUID,
+    amount: Decimal,
+    user_id: Optional[UUID],
+    guest_name: Optional[str],
+) -> Optional[Row]:
+    """Record a contribution with one guarded statement.
+
+    The item's running total is raised only if it is a group gift and the
+    amount still fits under the price; the contribution insert and the
+    wishlist version bump read from that conditional UPDATE in the same
+    WITH statement. A concurrent contributor to the same item waits on the
+    item row, and Postgres re-checks the guard against the latest total, so
+    the item can never be overfunded.
+
+    Both row locks are held until the caller commits, so commit right after
+    this call with no other awaits in between. The wishlist row is the hot
+    lock on busy lists: every contribution or reservation on the list bumps
+    it. It is updated last, only once the item guard has passed, so a
+    rejected contribution never touches it.
+
+    Returns a row with (id, amount, created_at, slug, version), or None if the guard rejected
+    the contribution or the wishlist is being deleted; the caller rolls back,
+    decides why and commits.
+    """
+    funded = (
+        update(Item)
+        .where(
+            Item.id == item_id,
+            Item.is_group_gift,
+            Item.funded_amount + amount <= Item.price,
+        )
+        .values(
+            funded_amount=Item.funded_amount + amount,
+            contribution_count=Item.contribution_count + 1,
+            updated_at=Item.updated_at,
+        )
+        .returning(Item.id, Item.wishlist_id)
+        .cte("funded")
+    )
+    inserted = (
+        insert(Contribution)
+        .from_select(
+            ["id", "item_id", "user_id", "guest_name", "amount"],
+            select(
+                literal(uuid.uuid4(), Contribution.id.type),
+                funded.c.id,
+                literal(user_id, Contribution.user_id.type),
+                literal(guest_name, Contribution.guest_name.type),
+                cast(literal(amount), Contribution.amount.type),
+            ),
+        )
+        .returning(Contribution.id, Contribution.amount, Contribution.created_at)
+        .cte("inserted")
+    )
+    bumped = (
+        update(Wishlist)
+        .where(
+            Wishlist.id == select(funded.c.wishlist_id).scalar_subquery(),
+            Wishlist.deleted_at.is_(None),
+        )
+        .values(version=Wishlist.version + 1)
+        .returning(Wishlist.slug, Wishlist.version)
+        .cte("bumped")
+    )
+    result = await db.execute(
+        select(inserted.c.id, inserted.c.amount, inserted.c.created_at, bumped.c.slug, bumped.c.version)
+        .select_from(inserted)
+        .join(bumped, true())
+    )
+    return result.one_or_none()
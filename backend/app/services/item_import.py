@@ -0,0 +1,142 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from app.core.config import settings
+
+# Row as parsed from the upload: (line number, fields) or (line number, parse error)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def detect_format(content_type: Optional[str]) -> Optional[str]:
+    """Map a request Content-Type to an import format."""
+    if not content_type:
+        return None
+    return CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream as UTF-8 and yield it line by line.
+
+    Only the current partial line is buffered, never the whole upload. A
+    leading BOM is dropped, which spreadsheet exports often add.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """One JSON object per line; blank lines are skipped."""
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def _ends_inside_quotes(line: str, in_quotes: bool) -> bool:
+    """Whether a CSV line leaves a quoted value open, continuing from ``in_quotes``.
+
+    As in RFC 4180, a value is quoted only if ``"`` is its first character;
+    a quote inside an unquoted value (``12" pizza pan``) is literal, and
+    ``""`` inside a quoted value is an escaped quote.
+    """
+    at_field_start = not in_quotes
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_quotes:
+            if char == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 2
+                    continue
+                in_quotes = False
+        elif char == ",":
+            at_field_start = True
+            i += 1
+            continue
+        elif char == '"' and at_field_start:
+            in_quotes = True
+        at_field_start = False
+        i += 1
+    return in_quotes
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """CSV with a header row naming ItemCreate fields.
+
+    Quoted values may span lines: physical lines are joined while a quoted
+    value is open, then the record is handed to the csv module. A record
+    that grows past IMPORT_MAX_RECORD_CHARS is reported as an error and
+    parsing resumes with the next line. Empty cells are dropped so field
+    defaults apply.
+    """
+    header = None
+    record = ""
+    record_line = 0
+    line_number = 0
+    in_quotes = False
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not in_quotes:
+            record_line = line_number
+            record = line
+        else:
+            record += "\n" + line
+        in_quotes = _ends_inside_quotes(line, in_quotes)
+        if in_quotes:
+            if len(record) > settings.IMPORT_MAX_RECORD_CHARS:
+                yield record_line, None, f"Quoted value is longer than {settings.IMPORT_MAX_RECORD_CHARS} characters"
+                record, in_quotes = "", False
+            continue
+
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        if len(values) > len(header):
+            yield record_line, None, f"Expected at most {len(header)} columns, got {len(values)}"
+            continue
+        yield record_line, {name: value.strip() for name, value in zip(header, values) if value.strip()}, None
+
+    if in_quotes:
+        yield record_line, None, "Unterminated quoted value"
+
+
+def parse_upload(chunks: AsyncIterator[bytes], import_format: str) -> AsyncIterator[ParsedRow]:
+    return parse_csv(chunks) if import_format == "csv" else parse_ndjson(chunks)
+
+
+def needs_autofill(row: Dict[str, Any]) -> bool:
+    """A row that has a URL but is missing the title or price autofill can provide."""
+    return bool(row.get("url")) and (not row.get("title") or row.get("price") in (None, ""))
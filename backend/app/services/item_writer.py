@@ -0,0 +1,66 @@
+import json
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.item import Item
+from app.schemas.item import ItemCreate, ItemBatchError
+
+
+def validate_item_row(row: Dict[str, Any]) -> Tuple[Optional[ItemCreate], Optional[List[Dict[str, Any]]]]:
+    """Validate one raw item payload, returning the item or its errors."""
+    try:
+        return ItemCreate.model_validate(row), None
+    except ValidationError as e:
+        # Round-trip through JSON so error contexts are serializable
+        return None, json.loads(e.json(include_url=False))
+
+
+def validate_item_rows(rows: List[Dict[str, Any]]) -> Tuple[List[ItemCreate], List[ItemBatchError]]:
+    """Validate raw item payloads one by one, collecting errors by row index."""
+    valid: List[ItemCreate] = []
+    errors: List[ItemBatchError] = []
+    for index, row in enumerate(rows):
+        item, row_errors = validate_item_row(row)
+        if item is None:
+            errors.append(ItemBatchError(index=index, errors=row_errors))
+        else:
+            valid.append(item)
+    return valid, errors
+
+
+async def insert_items(
+    db: AsyncSession,
+    wishlist_id: UUID,
+    created_by: UUID,
+    items: List[ItemCreate],
+) -> List[Item]:
+    """Insert items with one multi-row INSERT ... RETURNING, in input order.
+
+    Runs in the caller's transaction; the caller bumps the wishlist version
+    and commits. Rows are stamped one microsecond apart from the
+    transaction's now(), so lists ordered by created_at show them as if
+    they had been added one by one rather than in uuid order.
+    """
+    if not items:
+        return []
+    created_at = await db.scalar(select(func.now()))
+    result = await db.scalars(
+        insert(Item).returning(Item, sort_by_parameter_order=True),
+        [
+            {
+                "wishlist_id": wishlist_id,
+                "title": item.title,
+                "url": item.url,
+                "price": item.price,
+                "image_url": item.image_url,
+                "is_group_gift": item.is_group_gift,
+                "created_by": created_by,
+                "created_at": created_at + timedelta(microseconds=index),
+            }
+            for index, item in enumerate(items)
+        ],
+    )
+    return list(result.all())
@@ -0,0 +1,67 @@
+import uuid
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import select, update, literal, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.item import Item
+from app.db.models.wishlist import Wishlist
+from app.db.models.reservation import Reservation
+
+
+async def insert_reservation(
+    db: AsyncSession,
+    item_id: UUID,
+    user_id: Optional[UUID],
+    guest_name: Optional[str],
+) -> Optional[Row]:
+    """Reserve an item with one statement, relying on the unique item_id.
+
+    The reservation is inserted from the item row only if it is not a group
+    gift, and ON CONFLICT DO NOTHING turns a lost race into no row instead of
+    an error. The wishlist version bump reads from the insert's RETURNING in
+    the same WITH statement, after the reservation has been made.
+
+    The reservation's unique key and the wishlist row stay locked until the
+    caller commits, so commit right after this call with no other awaits in
+    between. The wishlist row is the hot lock on busy lists, shared with
+    every contribution and reservation on the list.
+
+    Returns a row with (id, item_id, guest_name, slug, version), or None if nothing
+    was reserved or the wishlist is being deleted; the caller rolls back,
+    decides why and commits.
+    """
+    reserved = (
+        insert(Reservation)
+        .from_select(
+            ["id", "item_id", "user_id", "guest_name"],
+            select(
+                literal(uuid.uuid4(), Reservation.id.type),
+                Item.id,
+                literal(user_id, Reservation.user_id.type),
+                literal(guest_name, Reservation.guest_name.type),
+            ).where(Item.id == item_id, Item.is_group_gift.is_(False)),
+        )
+        .on_conflict_do_nothing(index_elements=[Reservation.item_id])
+        .returning(Reservation.id, Reservation.item_id, Reservation.guest_name)
+        .cte("reserved")
+    )
+    bumped = (
+        update(Wishlist)
+        .where(
+            Wishlist.id == select(Item.wishlist_id)
+            .join(reserved, reserved.c.item_id == Item.id)
+            .scalar_subquery(),
+            Wishlist.deleted_at.is_(None),
+        )
+        .values(version=Wishlist.version + 1)
+        .returning(Wishlist.slug, Wishlist.version)
+        .cte("bumped")
+    )
+    result = await db.execute(
+        select(reserved.c.id, reserved.c.item_id, reserved.c.guest_name, bumped.c.slug, bumped.c.version)
+        .select_from(reserved)
+        .join(bumped, true())
+    )
+    return result.one_or_none()
@@ -0,0 +1,160 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
+from uuid import UUID
+from sqlalchemy import select, case
+from app.db.base import AsyncSessionLocal
+from app.db.models.wishlist import Wishlist
+from app.db.models.item import Item
+from app.db.models.reservation import Reservation
+from app.db.models.contribution import Contribution
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Rows fetched per round trip from the server-side cursor; one output chunk per batch
+EXPORT_FETCH_SIZE = 500
+
+# Item columns use the ItemCreate names so the CSV can be fed back to the import
+CSV_COLUMNS = [
+    "wishlist_slug", "wishlist_title", "title", "url", "price", "image_url", "is_group_gift",
+    "status", "funded_amount", "contribution_count", "created_at",
+]
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_line(record: dict) -> str:
+    return json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+
+
+def _csv_line(values: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(
+        ["" if value is None else value.isoformat() if isinstance(value, datetime) else value for value in values]
+    )
+    return buffer.getvalue()
+
+
+def _item_status():
+    """Owner-view status in SQL, matching the dashboard."""
+    return case(
+        (Item.is_group_gift & (Item.funded_amount >= Item.price), "Collected"),
+        (Item.is_group_gift, "Collecting"),
+        (Reservation.id.is_not(None), "Reserved"),
+        else_=None,
+    )
+
+
+def _items_query(wishlist_filter):
+    return (
+        select(Item, Wishlist.slug, Wishlist.title, _item_status())
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .outerjoin(Reservation, Reservation.item_id == Item.id)
+        .where(wishlist_filter)
+        .order_by(Wishlist.created_at.desc(), Wishlist.id, Item.created_at.desc(), Item.id.desc())
+        .execution_options(yield_per=EXPORT_FETCH_SIZE)
+    )
+
+
+async def stream_export(owner_id: UUID, export_format: str, wishlist_id: Optional[UUID] = None) -> AsyncIterator[str]:
+    """Stream an owner's wishlists as NDJSON or CSV, one chunk per fetched batch.
+
+    Rows are read through server-side cursors, so memory stays flat however
+    large the account is. The generator opens its own session because it
+    runs after the request's dependencies have been torn down.
+
+    NDJSON has typed records: every ``wishlist`` first, then every ``item``,
+    then every ``contribution``, linked by ids. Contributions carry only
+    amounts and dates; like the owner view, the export does not reveal who
+    reserved or contributed. CSV has one row per item in CSV_COLUMNS, with
+    contributions summed into ``funded_amount``.
+    """
+    wishlist_filter = (Wishlist.owner_id == owner_id) & Wishlist.deleted_at.is_(None)
+    if wishlist_id is not None:
+        wishlist_filter = wishlist_filter & (Wishlist.id == wishlist_id)
+
+    async with AsyncSessionLocal() as session:
+        if export_format == "csv":
+            yield _csv_line(CSV_COLUMNS)
+            result = await session.stream(_items_query(wishlist_filter))
+            async for rows in result.partitions():
+                yield "".join(
+                    _csv_line([
+                        slug, wishlist_title, item.title, item.url, item.price, item.image_url,
+                        item.is_group_gift, status, item.funded_amount, item.contribution_count, item.created_at,
+                    ])
+                    for item, slug, wishlist_title, status in rows
+                )
+            return
+
+        wishlists = await session.stream_scalars(
+            select(Wishlist)
+            .where(wishlist_filter)
+            .order_by(Wishlist.created_at.desc(), Wishlist.id)
+            .execution_options(yield_per=EXPORT_FETCH_SIZE)
+        )
+        async for batch in wishlists.partitions():
+            yield "".join(
+                _ndjson_line({
+                    "type": "wishlist",
+                    "id": wishlist.id,
+                    "slug": wishlist.slug,
+                    "title": wishlist.title,
+                    "description": wishlist.description,
+                    "created_at": wishlist.created_at,
+                    "updated_at": wishlist.updated_at,
+                })
+                for wishlist in batch
+            )
+
+        items = await session.stream(_items_query(wishlist_filter))
+        async for rows in items.partitions():
+            yield "".join(
+                _ndjson_line({
+                    "type": "item",
+                    "id": item.id,
+                    "wishlist_id": item.wishlist_id,
+                    "title": item.title,
+                    "url": item.url,
+                    "price": item.price,
+                    "image_url": item.image_url,
+                    "is_group_gift": item.is_group_gift,
+                    "status": status,
+                    "funded_amount": item.funded_amount,
+                    "contribution_count": item.contribution_count,
+                    "created_at": item.created_at,
+                    "updated_at": item.updated_at,
+                })
+                for item, _, _, status in rows
+            )
+
+        contributions = await session.stream_scalars(
+            select(Contribution)
+            .join(Item, Item.id == Contribution.item_id)
+            .join(Wishlist, Wishlist.id == Item.wishlist_id)
+            .where(wishlist_filter)
+            .order_by(Contribution.item_id, Contribution.created_at)
+            .execution_options(yield_per=EXPORT_FETCH_SIZE)
+        )
+        async for batch in contributions.partitions():
+            yield "".join(
+                _ndjson_line({
+                    "type": "contribution",
+                    "id": contribution.id,
+                    "item_id": contribution.item_id,
+                    "amount": contribution.amount,
+                    "created_at": contribution.created_at,
+                })
+                for contribution in batch
+            )
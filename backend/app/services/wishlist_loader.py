@@ -0,0 +1,291 @@
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.wishlist import Wishlist
+from app.db.models.item import Item
+from app.db.models.reservation import Reservation
+from app.db.models.contribution import Contribution
+from app.schemas.item import ItemResponse, ContributionInfo
+from app.core.pagination import encode_cursor
+from app.schemas.wishlist import WishlistResponse, WishlistPublicResponse, WishlistSummaryResponse
+
+
+def display_name(guest_name: str | None, user_id: UUID | None) -> str:
+    """Name shown to guests for a contribution or reservation."""
+    return guest_name or (f"User {str(user_id)[:8]}" if user_id else "Anonymous")
+
+
+def item_base_fields(item: Item) -> dict:
+    """Plain item columns, copied to avoid lazy loading during serialization."""
+    return {
+        "id": item.id,
+        "wishlist_id": item.wishlist_id,
+        "title": item.title,
+        "url": item.url,
+        "price": item.price,
+        "image_url": item.image_url,
+        "is_group_gift": item.is_group_gift,
+        "created_at": item.created_at,
+        "updated_at": item.updated_at,
+    }
+
+
+def _owner_items_query(item_filter):
+    """Owner-view item rows with reservation ids.
+
+    Funding status reads the running total on the item and reservation state
+    comes from an outer join, so the owner never sees names or amounts.
+    """
+    return (
+        select(Item, Reservation.id)
+        .outerjoin(Reservation, Reservation.item_id == Item.id)
+        .where(item_filter)
+        .order_by(Item.created_at.desc(), Item.id.desc())
+    )
+
+
+def _owner_item_response(item: Item, reservation_id: UUID | None) -> ItemResponse:
+    item_data = item_base_fields(item)
+    if item.is_group_gift:
+        item_data["status"] = "Collected" if item.funded_amount >= item.price else "Collecting"
+        item_data["is_reserved"] = False
+    else:
+        item_data["is_reserved"] = reservation_id is not None
+        item_data["status"] = "Reserved" if reservation_id else None
+    return ItemResponse(**item_data)
+
+
+def _paginate(stmt, limit: Optional[int], after: Optional[Tuple[datetime, UUID]]):
+    """Apply an (created_at, id) keyset cursor and fetch one extra row to detect a next page."""
+    if after is not None:
+        stmt = stmt.where(tuple_(Item.created_at, Item.id) < after)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def _split_page(rows: list, limit: Optional[int]) -> Tuple[list, Optional[str]]:
+    """Trim the extra row fetched by _paginate and build the next cursor."""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_item = rows[-1][0]
+    return rows, encode_cursor(last_item.created_at, last_item.id)
+
+
+async def load_item_page(
+    db: AsyncSession,
+    wishlist_id: UUID,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+) -> Tuple[List[ItemResponse], Optional[str]]:
+    """Load one page of items with plain columns only, no status or contributions."""
+    result = await db.execute(
+        _paginate(
+            select(Item).where(Item.wishlist_id == wishlist_id).order_by(Item.created_at.desc(), Item.id.desc()),
+            limit,
+            after,
+        )
+    )
+    rows, next_cursor = _split_page(result.all(), limit)
+    return [ItemResponse(**item_base_fields(item)) for item, in rows], next_cursor
+
+
+async def _collect_owner_items(
+    db: AsyncSession,
+    item_filter,
+    items_by_wishlist: Dict[UUID, List[ItemResponse]],
+) -> Dict[UUID, List[ItemResponse]]:
+    result = await db.execute(_owner_items_query(item_filter))
+
+    for item, reservation_id in result.all():
+        items_by_wishlist.setdefault(item.wishlist_id, []).append(_owner_item_response(item, reservation_id))
+
+    return items_by_wishlist
+
+
+async def load_owner_item_page(
+    db: AsyncSession,
+    wishlist_id: UUID,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+) -> Tuple[List[ItemResponse], Optional[str]]:
+    """Load one page of owner-view items for a wishlist in a single query."""
+    result = await db.execute(_paginate(_owner_items_query(Item.wishlist_id == wishlist_id), limit, after))
+    rows, next_cursor = _split_page(result.all(), limit)
+    return [_owner_item_response(item, reservation_id) for item, reservation_id in rows], next_cursor
+
+
+async def load_owner_dashboard(db: AsyncSession, owner_id: UUID) -> List[WishlistResponse]:
+    """Load every wishlist of an owner with items and statuses in two queries.
+
+    Items are selected through a join on the owner instead of a list of
+    wishlist ids, so the statement stays the same size for power users.
+    """
+    result = await db.execute(
+        select(Wishlist)
+        .where(Wishlist.owner_id == owner_id, Wishlist.deleted_at.is_(None))
+        .order_by(Wishlist.created_at.desc())
+    )
+    wishlists = result.scalars().all()
+    if not wishlists:
+        return []
+
+    owned_items = Item.wishlist_id.in_(select(Wishlist.id).where(Wishlist.owner_id == owner_id, Wishlist.deleted_at.is_(None)))
+    items_by_wishlist = await _collect_owner_items(
+        db, owned_items, {wishlist.id: [] for wishlist in wishlists}
+    )
+
+    return [
+        build_wishlist_response(wishlist, items_by_wishlist[wishlist.id], is_owner=True)
+        for wishlist in wishlists
+    ]
+
+
+async def load_owner_summary(db: AsyncSession, owner_id: UUID) -> List[WishlistSummaryResponse]:
+    """Per-wishlist counts and funding totals for an owner in a single query."""
+    owned_wishlists = select(Wishlist.id).where(Wishlist.owner_id == owner_id, Wishlist.deleted_at.is_(None))
+    stats = (
+        select(
+            Item.wishlist_id,
+            func.count(Item.id).label("items_count"),
+            func.count(Reservation.id).label("reserved_count"),
+            func.count(Item.id).filter(Item.is_group_gift).label("group_gifts_count"),
+            func.sum(Item.price).filter(Item.is_group_gift).label("funding_goal"),
+            func.sum(Item.funded_amount).filter(Item.is_group_gift).label("funded_total"),
+        )
+        .outerjoin(Reservation, Reservation.item_id == Item.id)
+        .where(Item.wishlist_id.in_(owned_wishlists))
+        .group_by(Item.wishlist_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            Wishlist,
+            func.coalesce(stats.c.items_count, 0),
+            func.coalesce(stats.c.reserved_count, 0),
+            func.coalesce(stats.c.group_gifts_count, 0),
+            func.coalesce(stats.c.funding_goal, 0),
+            func.coalesce(stats.c.funded_total, 0),
+        )
+        .outerjoin(stats, stats.c.wishlist_id == Wishlist.id)
+        .where(Wishlist.owner_id == owner_id, Wishlist.deleted_at.is_(None))
+        .order_by(Wishlist.created_at.desc())
+    )
+
+    return [
+        WishlistSummaryResponse(
+            id=wishlist.id,
+            slug=wishlist.slug,
+            title=wishlist.title,
+            description=wishlist.description,
+            owner_id=wishlist.owner_id,
+            created_at=wishlist.created_at,
+            updated_at=wishlist.updated_at,
+            items_count=items_count,
+            reserved_count=reserved_count,
+            group_gifts_count=group_gifts_count,
+            funding_goal=funding_goal,
+            funded_total=funded_total,
+        )
+        for wishlist, items_count, reserved_count, group_gifts_count, funding_goal, funded_total in result.all()
+    ]
+
+
+async def load_public_items(
+    db: AsyncSession,
+    wishlist_id: UUID,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+) -> Tuple[List[ItemResponse], Optional[str]]:
+    """Load one page of public-view items for a wishlist in at most two queries.
+
+    Items come joined with their reservation; contributions for every group
+    gift on the page are fetched together in one ordered query.
+    """
+    result = await db.execute(
+        _paginate(
+            select(Item, Reservation)
+            .outerjoin(Reservation, Reservation.item_id == Item.id)
+            .where(Item.wishlist_id == wishlist_id)
+            .order_by(Item.created_at.desc(), Item.id.desc()),
+            limit,
+            after,
+        )
+    )
+    rows, next_cursor = _split_page(result.all(), limit)
+
+    contributions_by_item: Dict[UUID, List[Contribution]] = {
+        item.id: [] for item, _ in rows if item.is_group_gift
+    }
+    if contributions_by_item:
+        contrib_result = await db.execute(
+            select(Contribution)
+            .where(Contribution.item_id.in_(list(contributions_by_item)))
+            .order_by(Contribution.created_at)
+        )
+        for contribution in contrib_result.scalars().all():
+            contributions_by_item[contribution.item_id].append(contribution)
+
+    item_responses = []
+    for item, reservation in rows:
+        item_data = item_base_fields(item)
+        if item.is_group_gift:
+            contributions = contributions_by_item[item.id]
+            item_data["total_contributions"] = item.funded_amount
+            item_data["contributions"] = [
+                ContributionInfo(name=display_name(c.guest_name, c.user_id), amount=c.amount)
+                for c in contributions
+            ]
+            item_data["reserved_by"] = None
+        else:
+            item_data["reserved_by"] = display_name(reservation.guest_name, reservation.user_id) if reservation else None
+            item_data["total_contributions"] = None
+            item_data["contributions"] = None
+        item_responses.append(ItemResponse(**item_data))
+
+    return item_responses, next_cursor
+
+
+def build_wishlist_response(
+    wishlist: Wishlist,
+    items: List[ItemResponse],
+    is_owner: bool,
+    next_cursor: Optional[str] = None,
+) -> WishlistResponse | WishlistPublicResponse:
+    """Wrap loaded items in the owner or public wishlist response."""
+    wishlist_dict = {
+        "id": wishlist.id,
+        "slug": wishlist.slug,
+        "title": wishlist.title,
+        "description": wishlist.description,
+        "created_at": wishlist.created_at,
+        "updated_at": wishlist.updated_at,
+        "items": items,
+        "next_cursor": next_cursor,
+    }
+
+    if is_owner:
+        wishlist_dict["owner_id"] = wishlist.owner_id
+        return WishlistResponse(**wishlist_dict)
+    return WishlistPublicResponse(**wishlist_dict)
+
+
+async def load_wishlist_view(
+    db: AsyncSession,
+    wishlist: Wishlist,
+    is_owner: bool,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+) -> WishlistResponse | WishlistPublicResponse:
+    """Build the owner or public response for one page of a wishlist in constant queries.
+
+    Without a limit every item is returned and next_cursor is None.
+    """
+    if is_owner:
+        items, next_cursor = await load_owner_item_page(db, wishlist.id, limit, after)
+    else:
+        items, next_cursor = await load_public_items(db, wishlist.id, limit, after)
+    return build_wishlist_response(wishlist, items, is_owner, next_cursor)
@@ -0,0 +1,87 @@
+from typing import List
+from uuid import UUID
+from sqlalchemy import select, delete, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.db.models.item import Item
+from app.db.models.wishlist import Wishlist
+
+
+async def has_many_items(db: AsyncSession, wishlist_id: UUID) -> bool:
+    """Whether the wishlist has more than WISHLIST_PURGE_THRESHOLD items.
+
+    Stops reading the items index after the threshold instead of counting
+    every item.
+    """
+    beyond_threshold = (
+        select(Item.id)
+        .where(Item.wishlist_id == wishlist_id)
+        .offset(settings.WISHLIST_PURGE_THRESHOLD)
+        .limit(1)
+    )
+    return bool((await db.execute(select(exists(beyond_threshold)))).scalar())
+
+
+async def delete_wishlist_now(db: AsyncSession, wishlist_id: UUID):
+    """Delete a wishlist with one statement; ON DELETE CASCADE removes its rows."""
+    await db.execute(
+        delete(Wishlist)
+        .where(Wishlist.id == wishlist_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def purge_wishlist(wishlist_id: UUID) -> int:
+    """Remove a soft-deleted wishlist, WISHLIST_PURGE_BATCH_SIZE items per transaction.
+
+    Uses its own session. Short transactions keep row locks and WAL bursts
+    small while the wishlist is already hidden by deleted_at. Returns the
+    number of items deleted; errors propagate, see purge_wishlist_in_background.
+    """
+    batch_size = settings.WISHLIST_PURGE_BATCH_SIZE
+    purged = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            batch = select(Item.id).where(Item.wishlist_id == wishlist_id).limit(batch_size)
+            result = await db.execute(
+                delete(Item)
+                .where(Item.id.in_(batch.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                break
+
+        await db.execute(
+            delete(Wishlist)
+            .where(Wishlist.id == wishlist_id, Wishlist.deleted_at.isnot(None))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    return purged
+
+
+async def purge_wishlist_in_background(wishlist_id: UUID):
+    """Background task after a delete request: purge_wishlist with error logging.
+
+    A failed batch (lock timeout, dropped connection) leaves the wishlist
+    soft-deleted with the rest of its items; committed batches stay done.
+    scripts/purge_deleted_wishlists.py finishes such leftovers.
+    """
+    try:
+        await purge_wishlist(wishlist_id)
+    except Exception as e:
+        print(f"⚠️ Purge of wishlist {wishlist_id} failed, run scripts.purge_deleted_wishlists to finish it: {e}")
+
+
+async def soft_deleted_wishlist_ids() -> List[UUID]:
+    """Soft-deleted wishlists whose purge has not finished, oldest first."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Wishlist.id)
+            .where(Wishlist.deleted_at.isnot(None))
+            .order_by(Wishlist.deleted_at)
+        )
+        return list(result.scalars())
@@ -0,0 +1,33 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.wishlist import Wishlist
+
+
+async def bump_wishlist_version(db: AsyncSession, wishlist_id: UUID) -> int:
+    """Increment the wishlist version inside the caller's transaction.
+
+    Must be called by every mutation of the wishlist, its items, reservations
+    or contributions so that ETags and cached responses go stale. Returns the
+    new version, which goes out with the wishlist_updated broadcast.
+    """
+    return await db.scalar(
+        update(Wishlist)
+        .where(Wishlist.id == wishlist_id)
+        .values(version=Wishlist.version + 1)
+        .returning(Wishlist.version)
+    )
+
+
+def make_etag(wishlist_id: UUID, version: int, view: str) -> str:
+    """Strong ETag for one representation of a wishlist at a given version."""
+    return f'"{wishlist_id}-{version}-{view}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -0,0 +1,17 @@
+-- Migration: Add running funding totals to items table
+-- Run this SQL script in your PostgreSQL database
+
+ALTER TABLE items
+ADD COLUMN IF NOT EXISTS funded_amount NUMERIC(10, 2) NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS contribution_count INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill totals from existing contributions
+UPDATE items
+SET funded_amount = totals.total,
+    contribution_count = totals.cnt
+FROM (
+    SELECT item_id, SUM(amount) AS total, COUNT(*) AS cnt
+    FROM contributions
+    GROUP BY item_id
+) AS totals
+WHERE items.id = totals.item_id;
@@ -0,0 +1,5 @@
+-- Migration: Add composite index for keyset pagination of wishlist items
+-- Run this SQL script in your PostgreSQL database
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_items_wishlist_created_at_id
+ON items (wishlist_id, created_at DESC, id DESC);
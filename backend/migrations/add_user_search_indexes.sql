@@ -0,0 +1,15 @@
+-- Migration: Indexes for user search
+-- Run this SQL script in your PostgreSQL database
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Prefix fast path for email lookups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower_prefix
+ON users (lower(email) text_pattern_ops);
+
+-- Trigram substring matching and similarity ranking
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower_trgm
+ON users USING gin (lower(email) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_full_name_trgm
+ON users USING gin (full_name gin_trgm_ops);
@@ -0,0 +1,5 @@
+-- Migration: Add version counter to wishlists table
+-- Run this SQL script in your PostgreSQL database
+
+ALTER TABLE wishlists
+ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
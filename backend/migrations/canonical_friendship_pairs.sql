@@ -0,0 +1,42 @@
+-- Migration: Store friendships as canonical ordered pairs
+-- Run this SQL script in your PostgreSQL database
+--
+-- Both directions of a friendship (A -> B and B -> A) now share one row keyed
+-- by (user_low, user_high). Existing reversed or re-sent duplicates are
+-- removed, keeping an accepted row over a pending one over a rejected one,
+-- and the most recently updated row within the same status.
+
+BEGIN;
+
+ALTER TABLE friendships
+ADD COLUMN IF NOT EXISTS user_low UUID,
+ADD COLUMN IF NOT EXISTS user_high UUID;
+
+UPDATE friendships
+SET user_low = LEAST(requester_id, addressee_id),
+    user_high = GREATEST(requester_id, addressee_id)
+WHERE user_low IS NULL OR user_high IS NULL;
+
+-- Dedupe reversed and re-sent pairs
+DELETE FROM friendships f
+USING (
+    SELECT id,
+           ROW_NUMBER() OVER (
+               PARTITION BY user_low, user_high
+               ORDER BY CASE status WHEN 'ACCEPTED' THEN 0 WHEN 'PENDING' THEN 1 ELSE 2 END,
+                        updated_at DESC
+           ) AS rn
+    FROM friendships
+) ranked
+WHERE f.id = ranked.id AND ranked.rn > 1;
+
+ALTER TABLE friendships
+ALTER COLUMN user_low SET NOT NULL,
+ALTER COLUMN user_high SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_friendships_pair ON friendships (user_low, user_high) INCLUDE (status);
+CREATE INDEX IF NOT EXISTS idx_friendships_user_high_status ON friendships (user_high, status);
+CREATE INDEX IF NOT EXISTS idx_friendships_requester_status ON friendships (requester_id, status);
+CREATE INDEX IF NOT EXISTS idx_friendships_addressee_status ON friendships (addressee_id, status);
+
+COMMIT;
@@ -0,0 +1,98 @@
+"""
+Benchmark concurrent contributions to one group gift.
+
+Seeds a throwaway wishlist with a single group gift, fires N contributions
+at it at once through the app in-process and reports throughput and status
+codes. Then checks that the item was never overfunded: the running total
+must equal the sum of contribution rows, stay within the price, and the
+number of accepted contributions must be exactly as many as fit.
+Cleans up after itself.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.benchmark_contributions [--contributions 500] [--amount 3] [--price 1000]
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from decimal import Decimal
+import httpx
+import shortuuid
+from sqlalchemy import delete, select, func
+from app.main import app
+from app.db.base import AsyncSessionLocal, engine
+from app.db.models import User, Wishlist, Item, Contribution
+
+
+async def seed_item(price: Decimal) -> tuple[User, Item]:
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"bench-contrib-{shortuuid.uuid()}@example.com", full_name="Contribution Bench", provider="local")
+        db.add(owner)
+        await db.flush()
+        wishlist = Wishlist(slug=f"bench-contrib-{shortuuid.uuid()}", title="Contribution benchmark", owner_id=owner.id)
+        db.add(wishlist)
+        await db.flush()
+        item = Item(wishlist_id=wishlist.id, title="Hot group gift", price=price, is_group_gift=True, created_by=owner.id)
+        db.add(item)
+        await db.commit()
+        return owner, item
+
+
+async def benchmark(contributions: int, amount: Decimal, price: Decimal):
+    owner, item = await seed_item(price)
+    transport = httpx.ASGITransport(app=app)
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+            async def contribute(i: int) -> int:
+                response = await client.post(
+                    f"/api/items/{item.id}/contribute",
+                    json={"guest_name": f"Guest {i}", "amount": str(amount)},
+                )
+                return response.status_code
+
+            print(f"\n🚀 Firing {contributions} contributions of {amount} at an item priced {price} ...")
+            started = time.perf_counter()
+            statuses = await asyncio.gather(*(contribute(i) for i in range(contributions)))
+            elapsed = time.perf_counter() - started
+
+        codes = Counter(statuses)
+        print(f"\n📊 {contributions} requests in {elapsed:.2f}s ({contributions / elapsed:.0f} req/s)")
+        print(f"   status codes: {dict(sorted(codes.items()))}")
+
+        async with AsyncSessionLocal() as db:
+            funded_amount, contribution_count = (await db.execute(
+                select(Item.funded_amount, Item.contribution_count).where(Item.id == item.id)
+            )).one()
+            rows_total, rows_count = (await db.execute(
+                select(func.coalesce(func.sum(Contribution.amount), 0), func.count(Contribution.id))
+                .where(Contribution.item_id == item.id)
+            )).one()
+
+        accepted = codes.get(201, 0)
+        expected = min(contributions, int(price // amount))
+        print(f"   funded_amount={funded_amount} contribution_count={contribution_count} "
+              f"sum(rows)={rows_total} count(rows)={rows_count}")
+
+        assert funded_amount <= price, f"Item overfunded: {funded_amount} > {price}"
+        assert funded_amount == rows_total, f"Running total {funded_amount} != sum of contributions {rows_total}"
+        assert contribution_count == rows_count == accepted, \
+            f"Counts disagree: counter={contribution_count} rows={rows_count} accepted={accepted}"
+        assert accepted == expected, f"Expected {expected} accepted contributions, got {accepted}"
+        assert set(codes) <= {201, 400}, f"Unexpected status codes: {dict(codes)}"
+        print("✅ Never overfunded, totals consistent")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Wishlist).where(Wishlist.owner_id == owner.id))
+            await db.execute(delete(User).where(User.id == owner.id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contributions", type=int, default=500, help="number of parallel contributions")
+    parser.add_argument("--amount", type=Decimal, default=Decimal("3"), help="amount of each contribution")
+    parser.add_argument("--price", type=Decimal, default=Decimal("1000"), help="price of the group gift")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.contributions, args.amount, args.price))
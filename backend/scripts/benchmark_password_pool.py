@@ -0,0 +1,109 @@
+"""
+Benchmark /health latency while password checks run.
+
+Probes GET /health in-process in a loop while N concurrent bcrypt
+verifications run, the same call login makes, first inline on the event
+loop (how login used to do it) and then on the password pool. Prints p50,
+p99 and max probe latency for an idle baseline and both runs. Does not
+need a database.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_password_pool [--logins 50] [--workers 4]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+import httpx
+from app.main import app
+from app.core.security import (
+    PasswordHashPool,
+    get_password_hash,
+    verify_password,
+    password_pool,
+)
+import app.core.security as security
+
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def probe_health(client: httpx.AsyncClient, done: asyncio.Event) -> list:
+    """Request /health until ``done`` is set, returning latencies in milliseconds.
+    
+    Latency is measured from when the probe was due, so time spent waiting
+    for a blocked event loop to wake the prober counts too.
+    """
+    latencies = []
+    while not done.is_set():
+        due = time.perf_counter() + PROBE_INTERVAL_SECONDS
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - due) * 1000)
+    return latencies
+
+
+async def run_phase(client: httpx.AsyncClient, load) -> tuple[list, float]:
+    done = asyncio.Event()
+    probe = asyncio.create_task(probe_health(client, done))
+    await asyncio.sleep(0.1)
+    started = time.perf_counter()
+    await load()
+    elapsed = time.perf_counter() - started
+    done.set()
+    return await probe, elapsed
+
+
+async def benchmark(logins: int, workers: int):
+    password = "correct horse battery staple"
+    hashed = get_password_hash(password)
+    pool = PasswordHashPool(workers=workers)
+    security.password_pool = pool
+
+    async def blocking_login():
+        await asyncio.sleep(0)
+        assert verify_password(password, hashed)
+
+    async def pooled_login():
+        assert await security.verify_password_async(password, hashed)
+
+    async def idle():
+        await asyncio.sleep(1)
+
+    async def blocking_load():
+        await asyncio.gather(*(blocking_login() for _ in range(logins)))
+
+    async def pooled_load():
+        await asyncio.gather(*(pooled_login() for _ in range(logins)))
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # The app logs every request; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            for label, load in (("idle", idle), ("blocking", blocking_load), ("pooled", pooled_load)):
+                results[label] = await run_phase(client, load)
+
+    print(f"\n📊 /health latency during {logins} concurrent password checks ({workers} pool workers):")
+    print(f"   {'run':<10} {'probes':>7} {'p50':>9} {'p99':>9} {'max':>9} {'load time':>10}")
+    for label, (latencies, elapsed) in results.items():
+        print(f"   {label:<10} {len(latencies):>7} {statistics.median(latencies):>7.1f}ms "
+              f"{percentile(latencies, 0.99):>7.1f}ms {max(latencies):>7.1f}ms {elapsed:>9.2f}s")
+    print(f"\n   pool stats: {pool.stats()}")
+    pool.shutdown()
+    password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50, help="concurrent password verifications")
+    parser.add_argument("--workers", type=int, default=4, help="password pool threads")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.logins, args.workers))
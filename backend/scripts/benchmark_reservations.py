@@ -0,0 +1,96 @@
+"""
+Burst-test reservations of one item.
+
+Seeds a throwaway wishlist with a single regular item, fires N reservation
+requests at it at once through the app in-process and checks that exactly
+one wins with 201 while every other request gets 409. Also counts the SQL
+statements sent per request, for the winning and the losing path, against
+the lock-then-check flow this replaced. Cleans up after itself.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.benchmark_reservations [--reservers 200]
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from decimal import Decimal
+import httpx
+import shortuuid
+from sqlalchemy import delete, select, func
+from app.main import app
+from app.db.base import AsyncSessionLocal, engine
+from app.db.instrumentation import QueryCounter
+from app.db.models import User, Wishlist, Item, Reservation
+
+# SELECT item FOR UPDATE, SELECT reservation, INSERT, UPDATE wishlist version,
+# refresh SELECT, SELECT wishlist slug
+PREVIOUS_STATEMENTS_PER_RESERVATION = 6
+
+
+async def seed_item(owner: User) -> Item:
+    async with AsyncSessionLocal() as db:
+        wishlist = Wishlist(slug=f"bench-reserve-{shortuuid.uuid()}", title="Reservation benchmark", owner_id=owner.id)
+        db.add(wishlist)
+        await db.flush()
+        item = Item(wishlist_id=wishlist.id, title="Popular gift", price=Decimal("50.00"), created_by=owner.id)
+        db.add(item)
+        await db.commit()
+        return item
+
+
+async def benchmark(reservers: int):
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"bench-reserve-{shortuuid.uuid()}@example.com", full_name="Reservation Bench", provider="local")
+        db.add(owner)
+        await db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+            async def reserve(item: Item, i: int) -> int:
+                response = await client.post(f"/api/items/{item.id}/reserve", json={"guest_name": f"Guest {i}"})
+                return response.status_code
+
+            # Single requests first, to count statements for each path
+            item = await seed_item(owner)
+            with QueryCounter() as winner:
+                assert await reserve(item, 0) == 201
+            with QueryCounter() as loser:
+                assert await reserve(item, 1) == 409
+
+            item = await seed_item(owner)
+            print(f"\n🚀 Firing {reservers} reservations at one item ...")
+            started = time.perf_counter()
+            with QueryCounter() as burst:
+                statuses = await asyncio.gather(*(reserve(item, i) for i in range(reservers)))
+            elapsed = time.perf_counter() - started
+
+        codes = Counter(statuses)
+        print(f"\n📊 {reservers} requests in {elapsed:.2f}s ({reservers / elapsed:.0f} req/s)")
+        print(f"   status codes: {dict(sorted(codes.items()))}")
+        print(f"   statements per request: winner={winner.count} loser={loser.count} "
+              f"burst average={burst.count / reservers:.2f} (previously {PREVIOUS_STATEMENTS_PER_RESERVATION})")
+
+        async with AsyncSessionLocal() as db:
+            reservation_rows = (await db.execute(
+                select(func.count(Reservation.id)).where(Reservation.item_id == item.id)
+            )).scalar_one()
+
+        assert codes.get(201) == 1, f"Expected exactly one winner, got {codes.get(201, 0)}"
+        assert codes.get(409) == reservers - 1, f"Expected {reservers - 1} conflicts, got {dict(codes)}"
+        assert reservation_rows == 1, f"Expected one reservation row, found {reservation_rows}"
+        print("✅ Exactly one winner")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Wishlist).where(Wishlist.owner_id == owner.id))
+            await db.execute(delete(User).where(User.id == owner.id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reservers", type=int, default=200, help="number of parallel reservation requests")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.reservers))
@@ -0,0 +1,151 @@
+"""
+Benchmark user search on a synthetic users table.
+
+Builds a throwaway schema with N synthetic users (1,000,000 by default), then
+times the old leading-wildcard ILIKE query without indexes against the
+indexed search used by GET /api/users/search (pg_trgm GIN indexes plus the
+lower(email) prefix index). The schema is dropped afterwards unless --keep.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.benchmark_user_search [--users 1000000] [--repeat 5] [--keep]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from sqlalchemy import text
+from app.db.base import engine
+from app.core.config import settings
+
+SCHEMA = "bench_user_search"
+
+FIRST_NAMES = ["anna", "boris", "clara", "dmitry", "elena", "fedor", "galina", "hugo", "irina", "jonas",
+               "katya", "leon", "maria", "nikita", "olga", "pavel", "quinn", "roman", "sofia", "timur"]
+LAST_NAMES = ["ivanov", "petrova", "smith", "garcia", "muller", "rossi", "novak", "kowalski", "silva", "larsen",
+              "kuznetsov", "popova", "brown", "lopez", "schmidt", "bianchi", "horvat", "nowak", "costa", "nielsen"]
+
+# (label, search term) pairs; terms containing "@" take the email prefix path
+SEARCH_TERMS = [
+    ("first name", "katya"),
+    ("last name", "kowalski"),
+    ("full name", "elena novak"),
+    ("email fragment", "user42424"),
+    ("email prefix", "user424242@ex"),
+    ("no match", "zzqxv"),
+]
+
+OLD_QUERY = text(f"""
+    SELECT id FROM {SCHEMA}.users
+    WHERE email ILIKE :contains OR full_name ILIKE :contains
+    LIMIT 20
+""")
+
+NEW_SCORE = """CAST(GREATEST(similarity(lower(email), :term),
+                          COALESCE(similarity(full_name, :term), 0)) * 10000 AS INTEGER)"""
+
+NEW_SUBSTRING_QUERY = text(f"""
+    SELECT id, {NEW_SCORE} AS score FROM {SCHEMA}.users
+    WHERE lower(email) LIKE :contains OR full_name ILIKE :contains
+    ORDER BY score DESC, id
+    LIMIT 21
+""")
+
+NEW_PREFIX_QUERY = text(f"""
+    SELECT id, {NEW_SCORE} AS score FROM {SCHEMA}.users
+    WHERE lower(email) LIKE :prefix
+    ORDER BY score DESC, id
+    LIMIT 21
+""")
+
+
+def _name_array(names):
+    return "ARRAY[" + ", ".join(f"'{name}'" for name in names) + "]"
+
+
+async def build_table(users: int):
+    print(f"\n🏗️  Generating {users:,} synthetic users in {SCHEMA}.users ...")
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"""
+            CREATE TABLE {SCHEMA}.users (
+                id UUID PRIMARY KEY,
+                email VARCHAR NOT NULL UNIQUE,
+                full_name VARCHAR
+            )
+        """))
+        await conn.execute(text(f"""
+            INSERT INTO {SCHEMA}.users (id, email, full_name)
+            SELECT gen_random_uuid(),
+                   'user' || g || '@example' || (g % 50) || '.com',
+                   CASE WHEN g % 10 = 0 THEN NULL
+                        ELSE initcap(({_name_array(FIRST_NAMES)})[1 + (g * 7919) % {len(FIRST_NAMES)}] || ' ' ||
+                                     ({_name_array(LAST_NAMES)})[1 + (g * 104729) % {len(LAST_NAMES)}])
+                   END
+            FROM generate_series(1::BIGINT, CAST(:users AS BIGINT)) AS g
+        """), {"users": users})
+        await conn.execute(text(f"ANALYZE {SCHEMA}.users"))
+    print(f"   done in {time.perf_counter() - started:.1f}s")
+
+
+async def build_indexes():
+    print("\n🏗️  Building search indexes ...")
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE INDEX ON {SCHEMA}.users (lower(email) text_pattern_ops)"))
+        await conn.execute(text(f"CREATE INDEX ON {SCHEMA}.users USING gin (lower(email) gin_trgm_ops)"))
+        await conn.execute(text(f"CREATE INDEX ON {SCHEMA}.users USING gin (full_name gin_trgm_ops)"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.users"))
+    print(f"   done in {time.perf_counter() - started:.1f}s")
+
+
+async def time_query(query, params: dict, repeat: int) -> float:
+    """Median wall time in milliseconds over ``repeat`` runs, after one warm-up."""
+    timings = []
+    async with engine.connect() as conn:
+        await conn.execute(query, params)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            (await conn.execute(query, params)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def benchmark(users: int, repeat: int, keep: bool):
+    print(f"📋 Database: {settings.DATABASE_URL[:80]}...")
+    await build_table(users)
+
+    old_timings = {}
+    for label, term in SEARCH_TERMS:
+        old_timings[label] = await time_query(OLD_QUERY, {"contains": f"%{term}%"}, repeat)
+
+    await build_indexes()
+
+    new_timings = {}
+    for label, term in SEARCH_TERMS:
+        if "@" in term:
+            new_timings[label] = await time_query(NEW_PREFIX_QUERY, {"term": term, "prefix": f"{term}%"}, repeat)
+        else:
+            new_timings[label] = await time_query(NEW_SUBSTRING_QUERY, {"term": term, "contains": f"%{term}%"}, repeat)
+
+    print(f"\n📊 Median latency over {repeat} runs ({users:,} users):")
+    print(f"   {'query':<16} {'old ILIKE':>12} {'indexed':>12}")
+    for label, _ in SEARCH_TERMS:
+        print(f"   {label:<16} {old_timings[label]:>10.1f}ms {new_timings[label]:>10.1f}ms")
+
+    if not keep:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        print(f"\n🗑️  Dropped schema {SCHEMA}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000, help="number of synthetic users")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark schema afterwards")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.users, args.repeat, args.keep))
@@ -0,0 +1,207 @@
+"""
+Benchmark WebSocket fan-out to one crowded room.
+
+Puts N fake sockets (5,000 by default) in one wishlist room, most of them
+fast, some slow like mobile clients and a few stalled readers whose sends
+never complete. Then it fires a burst of broadcasts through:
+
+- previous: the old sequential broadcast, which awaited send_json on each
+  socket in turn. It is run with and without the stalled readers, and
+  each broadcast is given up after --stall-timeout, because a stalled
+  reader blocks it forever.
+- queued: WebSocketManager with per-connection queues and writer tasks.
+
+For each run it prints:
+- how long the broadcast call blocked the request that triggered it
+- delivery latency to the healthy sockets
+- how many times the message was serialized
+- how many slow consumers were evicted
+
+Does not need a database or a running server.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_websocket_fanout [--sockets 5000] [--stalled 50] [--broadcasts 50]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from app.core.websocket_manager import WebSocketManager
+
+SLUG = "bench-fanout"
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FakeSocket:
+    """Stands in for a Starlette WebSocket; records when messages arrive."""
+
+    serializations = 0
+
+    def __init__(self, kind: str, max_delay: float, rng: random.Random):
+        self.kind = kind
+        self.max_delay = max_delay
+        self.rng = rng
+        self.received = []
+        self.closed = asyncio.Event()
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload: str):
+        if self.kind == "stalled":
+            # A reader that stopped draining its TCP buffer: the send never finishes
+            await self.closed.wait()
+            raise RuntimeError("socket closed")
+        if self.kind == "slow":
+            await asyncio.sleep(self.rng.uniform(0, self.max_delay))
+        self.received.append(time.perf_counter())
+
+    async def send_json(self, message: dict):
+        # Like Starlette, every call serializes the message again
+        FakeSocket.serializations += 1
+        await self.send_text(json.dumps(message, separators=(",", ":"), ensure_ascii=False))
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+        self.closed.set()
+
+
+class PreviousManager:
+    """The sequential broadcast WebSocketManager used before per-connection queues."""
+
+    def __init__(self):
+        self.active_connections = {}
+
+    async def connect(self, websocket, slug: str):
+        await websocket.accept()
+        self.active_connections.setdefault(slug, set()).add(websocket)
+
+    def disconnect(self, websocket, slug: str):
+        if slug in self.active_connections:
+            self.active_connections[slug].discard(websocket)
+
+    async def broadcast_to_room(self, slug: str, message: dict):
+        disconnected = set()
+        for connection in self.active_connections.get(slug, ()):
+            try:
+                await connection.send_json(message)
+            except Exception:
+                disconnected.add(connection)
+        for connection in disconnected:
+            self.disconnect(connection, slug)
+
+
+def make_sockets(args, include_stalled: bool) -> list:
+    rng = random.Random(args.seed)
+    sockets = []
+    for i in range(args.sockets):
+        if i < args.stalled:
+            if include_stalled:
+                sockets.append(FakeSocket("stalled", 0, rng))
+        elif rng.random() < args.slow_share:
+            sockets.append(FakeSocket("slow", args.slow_delay / 1000, rng))
+        else:
+            sockets.append(FakeSocket("fast", 0, rng))
+    return sockets
+
+
+async def run(label: str, manager, sockets: list, broadcasts: int, args) -> dict:
+    FakeSocket.serializations = 0
+    for socket in sockets:
+        await manager.connect(socket, SLUG)
+
+    healthy = [socket for socket in sockets if socket.kind != "stalled"]
+    starts, call_times = [], []
+    completed = 0
+    for n in range(broadcasts):
+        started = time.perf_counter()
+        starts.append(started)
+        message = {"type": "wishlist_updated", "slug": SLUG, "n": n}
+        try:
+            if isinstance(manager, PreviousManager):
+                await asyncio.wait_for(manager.broadcast_to_room(SLUG, message), timeout=args.stall_timeout)
+            else:
+                await manager.broadcast_to_room(SLUG, message)
+        except asyncio.TimeoutError:
+            call_times.append((time.perf_counter() - started) * 1000)
+            break
+        call_times.append((time.perf_counter() - started) * 1000)
+        completed += 1
+        await asyncio.sleep(args.interval / 1000)
+
+    # Give the writer tasks time to drain to the healthy sockets
+    deadline = time.perf_counter() + args.stall_timeout
+    while time.perf_counter() < deadline and any(len(socket.received) < completed for socket in healthy):
+        await asyncio.sleep(0.01)
+
+    # A broadcast given up on still counts what reached sockets before the stall
+    attempted = len(starts)
+    delivery = [
+        (received - starts[n]) * 1000
+        for socket in healthy
+        for n, received in enumerate(socket.received[:attempted])
+    ]
+    delivered = sum(min(len(socket.received), attempted) for socket in healthy)
+    result = {
+        "label": label,
+        "sockets": len(sockets),
+        "broadcasts": f"{completed}/{broadcasts}",
+        "call_p50": statistics.median(call_times),
+        "call_max": max(call_times),
+        "delivered": f"{delivered}/{attempted * len(healthy)}",
+        "delivery_p50": statistics.median(delivery) if delivery else float("nan"),
+        "delivery_p99": percentile(delivery, 0.99) if delivery else float("nan"),
+        "delivery_max": max(delivery) if delivery else float("nan"),
+        "serializations": FakeSocket.serializations if isinstance(manager, PreviousManager) else manager.broadcasts,
+        "evicted": sum(1 for socket in sockets if socket.close_code is not None),
+    }
+
+    # Release stalled sends and writer tasks before the next run
+    for socket in sockets:
+        manager.disconnect(socket, SLUG)
+        socket.closed.set()
+    await asyncio.sleep(0.05)
+    return result
+
+
+async def benchmark(args):
+    print(f"\n🔌 {args.sockets} sockets in one room: {args.stalled} stalled, "
+          f"~{args.slow_share:.0%} slow (up to {args.slow_delay:.0f}ms per send), rest fast")
+    results = [
+        await run("previous", PreviousManager(), make_sockets(args, True), args.previous_broadcasts, args),
+        await run("previous, no stalled", PreviousManager(), make_sockets(args, False), args.previous_broadcasts, args),
+        await run("queued", WebSocketManager(queue_size=args.queue_size, send_timeout=args.send_timeout),
+                  make_sockets(args, True), args.broadcasts, args),
+    ]
+
+    print(f"\n📊 Broadcast burst, {args.interval:.0f}ms apart (previous runs give up a broadcast after {args.stall_timeout:.0f}s):")
+    print(f"   {'run':<22} {'broadcasts':>10} {'call p50':>10} {'call max':>10} {'delivered':>15} "
+          f"{'deliv p50':>10} {'deliv p99':>10} {'deliv max':>10} {'json':>7} {'evicted':>8}")
+    for r in results:
+        print(f"   {r['label']:<22} {r['broadcasts']:>10} {r['call_p50']:>8.1f}ms {r['call_max']:>8.1f}ms "
+              f"{r['delivered']:>15} {r['delivery_p50']:>8.1f}ms {r['delivery_p99']:>8.1f}ms "
+              f"{r['delivery_max']:>8.1f}ms {r['serializations']:>7} {r['evicted']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sockets", type=int, default=5000, help="sockets in the room")
+    parser.add_argument("--stalled", type=int, default=50, help="readers whose sends never complete")
+    parser.add_argument("--slow-share", type=float, default=0.1, help="share of slow sockets")
+    parser.add_argument("--slow-delay", type=float, default=5, help="max per-send delay of a slow socket, ms")
+    parser.add_argument("--broadcasts", type=int, default=50, help="broadcasts in the queued run")
+    parser.add_argument("--previous-broadcasts", type=int, default=5, help="broadcasts in the previous runs")
+    parser.add_argument("--interval", type=float, default=10, help="ms between broadcasts")
+    parser.add_argument("--queue-size", type=int, default=32, help="per-connection queue size")
+    parser.add_argument("--send-timeout", type=float, default=10, help="per-send timeout of the writer tasks, s")
+    parser.add_argument("--stall-timeout", type=float, default=5, help="seconds before a broadcast or drain is given up")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for socket kinds and delays")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args))
@@ -0,0 +1,94 @@
+"""
+Assert that wishlist reads issue a constant number of queries.
+
+Seeds throwaway wishlists of growing size, requests them through the app
+in-process and checks that the number of SQL statements does not grow with
+the number of items. Cleans up after itself.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.check_query_counts
+"""
+import asyncio
+from decimal import Decimal
+import httpx
+import shortuuid
+from sqlalchemy import delete
+from app.main import app
+from app.db.base import AsyncSessionLocal
+from app.db.instrumentation import QueryCounter
+from app.db.models import User, Wishlist, Item, Reservation, Contribution
+from app.core.security import create_access_token
+
+ITEM_COUNTS = [1, 10, 60]
+
+
+async def seed_wishlist(owner: User, item_count: int) -> str:
+    """Create a wishlist with a mix of reserved items and funded group gifts."""
+    async with AsyncSessionLocal() as db:
+        wishlist = Wishlist(slug=f"querycount-{shortuuid.uuid()}", title=f"{item_count} items", owner_id=owner.id)
+        db.add(wishlist)
+        await db.flush()
+        for i in range(item_count):
+            is_group_gift = i % 2 == 0
+            item = Item(
+                wishlist_id=wishlist.id,
+                title=f"Item {i}",
+                price=Decimal("100.00"),
+                is_group_gift=is_group_gift,
+                funded_amount=Decimal("25.00") if is_group_gift else Decimal("0"),
+                contribution_count=2 if is_group_gift else 0,
+                created_by=owner.id,
+            )
+            db.add(item)
+            await db.flush()
+            if is_group_gift:
+                db.add_all([
+                    Contribution(item_id=item.id, guest_name="Guest", amount=Decimal("10.00")),
+                    Contribution(item_id=item.id, guest_name="Guest", amount=Decimal("15.00")),
+                ])
+            elif i % 3 == 0:
+                db.add(Reservation(item_id=item.id, guest_name="Guest"))
+        await db.commit()
+        return wishlist.slug
+
+
+async def count_queries(client: httpx.AsyncClient, url: str, headers: dict | None = None) -> int:
+    with QueryCounter() as counter:
+        response = await client.get(url, headers=headers)
+    response.raise_for_status()
+    return counter.count
+
+
+async def main():
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"querycount-{shortuuid.uuid()}@example.com", full_name="Query Count", provider="local")
+        db.add(owner)
+        await db.commit()
+        await db.refresh(owner)
+
+    owner_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(owner.id)})}"}
+    transport = httpx.ASGITransport(app=app)
+    counts = {"owner": [], "public": [], "dashboard": [], "summary": []}
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for item_count in ITEM_COUNTS:
+                slug = await seed_wishlist(owner, item_count)
+                counts["owner"].append(await count_queries(client, f"/api/wishlists/{slug}", owner_headers))
+                counts["public"].append(await count_queries(client, f"/api/wishlists/{slug}"))
+                counts["dashboard"].append(await count_queries(client, "/api/wishlists", owner_headers))
+                counts["summary"].append(await count_queries(client, "/api/wishlists?summary=true", owner_headers))
+
+        for view, view_counts in counts.items():
+            print(f"   {view}: {dict(zip(ITEM_COUNTS, view_counts))}")
+            assert len(set(view_counts)) == 1, f"{view} query count grows with item count: {view_counts}"
+        print("✅ Query counts are flat")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Wishlist).where(Wishlist.owner_id == owner.id))
+            await db.execute(delete(User).where(User.id == owner.id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
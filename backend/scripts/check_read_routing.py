@@ -0,0 +1,102 @@
+"""
+Check read-replica routing with two local databases.
+
+Point DATABASE_URL and READ_DATABASE_URL at two different (non-replicating)
+Postgres databases. The script creates the tables in the "replica", creates
+a wishlist through the API (it only lands on the primary) and then reads it:
+
+- as its owner right away -> 200, read-your-writes sent the read to the primary
+- as a guest              -> 404, the read went to the empty replica
+- as the owner after READ_STICKY_SECONDS -> 404, stickiness expired
+
+Then it copies the wishlist to the "replica" and renames it on the primary,
+like a replica that has not caught up yet. Another client sees the old
+title, unless it passes the new version as min_version the way the public
+page does after a wishlist_updated event.
+
+Cleans up after itself.
+
+Usage (from the backend directory):
+    READ_DATABASE_URL=postgresql+asyncpg://.../wishlist_replica python -m scripts.check_read_routing
+"""
+import asyncio
+import httpx
+import shortuuid
+from sqlalchemy import delete, select
+from app.main import app
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.base import AsyncSessionLocal, ReadSessionLocal, Base, engine, read_engine
+from app.db.models import User, Wishlist
+
+
+async def main():
+    if read_engine is None:
+        raise SystemExit("❌ READ_DATABASE_URL is not set")
+
+    async with read_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        owner = User(email=f"readrouting-{shortuuid.uuid()}@example.com", full_name="Read Routing", provider="local")
+        db.add(owner)
+        await db.commit()
+
+    owner_headers = {
+        "Authorization": f"Bearer {create_access_token(data={'sub': str(owner.id)})}",
+    }
+    # Guests are never kept on the primary, whatever address they come from
+    other_headers = {}
+    transport = httpx.ASGITransport(app=app)
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post("/api/wishlists", json={"title": "Read routing"}, headers=owner_headers)
+            created.raise_for_status()
+            slug = created.json()["slug"]
+
+            owner_read = await client.get(f"/api/wishlists/{slug}", headers=owner_headers)
+            other_read = await client.get(f"/api/wishlists/{slug}", headers=other_headers)
+            await asyncio.sleep(settings.READ_STICKY_SECONDS + 0.5)
+            late_read = await client.get(f"/api/wishlists/{slug}", headers=owner_headers)
+
+            # A lagging replica: it has the wishlist, but not the rename below
+            async with AsyncSessionLocal() as db:
+                wishlist = (await db.execute(select(Wishlist).where(Wishlist.slug == slug))).scalar_one()
+            async with ReadSessionLocal() as replica:
+                replica.add(User(id=owner.id, email=owner.email, full_name=owner.full_name, provider=owner.provider))
+                await replica.flush()
+                replica.add(Wishlist(id=wishlist.id, slug=slug, title=wishlist.title, owner_id=owner.id, version=wishlist.version))
+                await replica.commit()
+            renamed = await client.put(f"/api/wishlists/{slug}", json={"title": "Read routing, renamed"}, headers=owner_headers)
+            renamed.raise_for_status()
+            stale_read = await client.get(f"/api/wishlists/{slug}", headers=other_headers)
+            fresh_read = await client.get(f"/api/wishlists/{slug}", params={"min_version": wishlist.version + 1},
+                                          headers=other_headers)
+
+        print(f"   owner right after write: {owner_read.status_code}")
+        print(f"   other client:            {other_read.status_code}")
+        print(f"   owner after sticky TTL:  {late_read.status_code}")
+        print(f"   lagging replica:         {stale_read.json()['title']!r}")
+        print(f"   with min_version:        {fresh_read.json()['title']!r}")
+        assert owner_read.status_code == 200, "Writer did not read from the primary"
+        assert other_read.status_code == 404, "Other client did not read from the replica"
+        assert late_read.status_code == 404, "Writer stayed on the primary after READ_STICKY_SECONDS"
+        assert stale_read.json()["title"] == "Read routing", "Other client did not read the lagging replica"
+        assert fresh_read.json()["title"] == "Read routing, renamed", "min_version did not skip the lagging replica"
+        print("✅ Reads follow the replica with read-your-writes stickiness and min_version")
+    finally:
+        async with ReadSessionLocal() as replica:
+            await replica.execute(delete(Wishlist).where(Wishlist.owner_id == owner.id))
+            await replica.execute(delete(User).where(User.id == owner.id))
+            await replica.commit()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Wishlist).where(Wishlist.owner_id == owner.id))
+            await db.execute(delete(User).where(User.id == owner.id))
+            await db.commit()
+        await engine.dispose()
+        await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
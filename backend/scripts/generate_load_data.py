@@ -0,0 +1,301 @@
+"""
+Generate a synthetic load-test dataset with COPY.
+
+Writes users, wishlists, items, reservations, contributions and friendships
+straight into the application tables through asyncpg's
+copy_records_to_table, bypassing the ORM. Distributions are skewed like
+real traffic:
+
+- a few power users own most wishlists
+- a small share of viral wishlists have many items, reservations and
+  contributions
+- heavy contributors account for most registered contributions
+- popular users have many friends
+
+Output is deterministic for a given --seed and size parameters. The
+denormalized columns the app relies on are kept consistent:
+- items.funded_amount and items.contribution_count match the
+  contributions
+- contributions never exceed an item's price
+- friendships are stored as canonical (user_low, user_high) pairs
+- wishlists.version counts one bump per item, reservation and contribution
+
+Every user has the password "loadtest-password" and an email of the form
+load<seed>-<n>@example.com, so scripts.loadtest can log in as any of them.
+Data is added to what is already there, so use another --seed for a second
+batch, or --truncate to empty the application tables first.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.generate_load_data [--users 100000] [--seed 42] [--truncate]
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.base import engine
+
+PASSWORD = "loadtest-password"
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+YEAR_SECONDS = 365 * 24 * 3600
+
+# Share of wishlists that go viral and how much bigger and busier they are
+VIRAL_RATE = 0.002
+VIRAL_ITEMS_FACTOR = 60
+VIRAL_ACTIVITY_FACTOR = 10
+
+GROUP_GIFT_RATE = 0.3
+RESERVED_RATE = 0.25
+GUEST_RATE = 0.3
+# Higher skew concentrates picks on low user numbers
+OWNER_SKEW = 2.0
+CONTRIBUTOR_SKEW = 2.5
+# User 0 starts 1 + FRIEND_SKEW times as many friendships as the last user
+FRIEND_SKEW = 1.5
+
+FIRST_NAMES = ["anna", "boris", "clara", "dmitry", "elena", "fedor", "galina", "hugo", "irina", "jonas",
+               "katya", "leon", "maria", "nikita", "olga", "pavel", "quinn", "roman", "sofia", "timur"]
+LAST_NAMES = ["ivanov", "petrova", "smith", "garcia", "muller", "rossi", "novak", "kowalski", "silva", "larsen",
+              "kuznetsov", "popova", "brown", "lopez", "schmidt", "bianchi", "horvat", "nowak", "costa", "nielsen"]
+GIFTS = ["headphones", "board game", "coffee grinder", "backpack", "e-reader", "sneakers", "tent", "camera",
+         "cookbook", "desk lamp", "watch", "bicycle", "perfume", "scarf", "keyboard", "vinyl player"]
+OCCASIONS = ["Birthday", "New Year", "Wedding", "Housewarming", "Graduation", "Baby shower", "Anniversary"]
+
+USER_COLUMNS = ["id", "email", "password_hash", "full_name", "provider", "created_at", "updated_at"]
+WISHLIST_COLUMNS = ["id", "slug", "title", "description", "owner_id", "version", "created_at", "updated_at"]
+ITEM_COLUMNS = ["id", "wishlist_id", "title", "url", "price", "image_url", "is_group_gift",
+                "funded_amount", "contribution_count", "created_by", "created_at", "updated_at"]
+RESERVATION_COLUMNS = ["id", "item_id", "user_id", "guest_name", "created_at"]
+CONTRIBUTION_COLUMNS = ["id", "item_id", "user_id", "guest_name", "amount", "created_at"]
+FRIENDSHIP_COLUMNS = ["id", "requester_id", "addressee_id", "user_low", "user_high", "status", "created_at", "updated_at"]
+
+TABLES = ["friendships", "contributions", "reservations", "items", "wishlists", "users"]
+
+
+class Generator:
+    """Deterministic record generator for one seed and set of sizes."""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.users = args.users
+        self.counts = dict.fromkeys(TABLES, 0)
+
+    def user_id(self, n: int) -> uuid.UUID:
+        """Id of user number n, derived from the seed so any stage can refer to it."""
+        digest = hashlib.blake2b(f"{self.args.seed}:user:{n}".encode(), digest_size=16).digest()
+        return uuid.UUID(bytes=digest, version=4)
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def skewed_user(self, skew: float) -> int:
+        """User number with density growing towards 0 as skew rises (1.0 is uniform)."""
+        return int(self.users * self.rng.random() ** skew)
+
+    def moment(self, after: datetime) -> datetime:
+        """A time between ``after`` and BASE_TIME, biased towards recent activity."""
+        span = max((BASE_TIME - after).total_seconds(), 1)
+        return after + timedelta(seconds=span * self.rng.random() ** 0.5)
+
+    def guest_or_user(self, skew: float):
+        if self.rng.random() < GUEST_RATE:
+            return None, f"Guest {self.rng.randrange(1_000_000)}"
+        return self.user_id(self.skewed_user(skew)), None
+
+    # Users
+
+    def user_records(self, start: int, stop: int, password_hash: str):
+        seed = self.args.seed
+        for n in range(start, stop):
+            created_at = BASE_TIME - timedelta(seconds=self.rng.randrange(YEAR_SECONDS))
+            full_name = f"{self.rng.choice(FIRST_NAMES).title()} {self.rng.choice(LAST_NAMES).title()}"
+            yield (self.user_id(n), f"load{seed}-{n}@example.com", password_hash, full_name,
+                   "local", created_at, created_at)
+
+    # Wishlists with their items, reservations and contributions
+
+    def item_count(self, viral: bool) -> int:
+        mean = self.args.items_per_wishlist
+        if viral:
+            return self.rng.randint(VIRAL_ITEMS_FACTOR * mean // 2, VIRAL_ITEMS_FACTOR * mean * 3 // 2)
+        # Keep the overall mean close to --items-per-wishlist despite viral lists
+        regular_mean = mean * (1 - VIRAL_RATE * VIRAL_ITEMS_FACTOR) / (1 - VIRAL_RATE)
+        return int(self.rng.expovariate(1 / max(regular_mean, 0.1)))
+
+    def contribution_amounts(self, price_cents: int, viral: bool) -> list:
+        """Cents per contribution; the sum never exceeds the price."""
+        mean = self.args.contributions_per_gift * (VIRAL_ACTIVITY_FACTOR if viral else 1)
+        count = int(self.rng.expovariate(1 / mean)) if mean > 0 else 0
+        if count == 0:
+            return []
+        funded = 1.0 if self.rng.random() < 0.3 else self.rng.random()
+        total = int(price_cents * funded)
+        count = min(count, total)
+        if count == 0:
+            return []
+        cuts = sorted(self.rng.sample(range(1, total), count - 1)) if count > 1 else []
+        edges = [0] + cuts + [total]
+        return [edges[i + 1] - edges[i] for i in range(count)]
+
+    def wishlist_records(self, start: int, stop: int):
+        """Records for wishlists number start..stop-1 and everything in them."""
+        seed = self.args.seed
+        wishlists, items, reservations, contributions = [], [], [], []
+        for n in range(start, stop):
+            owner_id = self.user_id(self.skewed_user(OWNER_SKEW))
+            viral = self.rng.random() < VIRAL_RATE
+            wishlist_id = self.new_id()
+            created_at = BASE_TIME - timedelta(seconds=self.rng.randrange(YEAR_SECONDS))
+            changes = 0
+            last_change = created_at
+
+            for _ in range(self.item_count(viral)):
+                item_id = self.new_id()
+                item_created = self.moment(created_at)
+                price_cents = min(max(int(self.rng.lognormvariate(8.5, 1.2)), 100), 9_999_999_999)
+                is_group_gift = self.rng.random() < GROUP_GIFT_RATE
+                gift = self.rng.choice(GIFTS)
+                funded_cents = 0
+                amounts = self.contribution_amounts(price_cents, viral) if is_group_gift else []
+                for cents in amounts:
+                    user_id, guest_name = self.guest_or_user(CONTRIBUTOR_SKEW)
+                    contributed_at = self.moment(item_created)
+                    contributions.append((self.new_id(), item_id, user_id, guest_name,
+                                          Decimal(cents).scaleb(-2), contributed_at))
+                    funded_cents += cents
+                    last_change = max(last_change, contributed_at)
+                reserved_rate = min(RESERVED_RATE * (2.4 if viral else 1), 1.0)
+                if not is_group_gift and self.rng.random() < reserved_rate:
+                    user_id, guest_name = self.guest_or_user(OWNER_SKEW)
+                    reserved_at = self.moment(item_created)
+                    reservations.append((self.new_id(), item_id, user_id, guest_name, reserved_at))
+                    changes += 1
+                    last_change = max(last_change, reserved_at)
+                items.append((
+                    item_id, wishlist_id, f"{gift.title()} #{self.rng.randrange(10_000)}",
+                    f"https://shop.example.com/{gift.replace(' ', '-')}/{item_id.hex[:12]}",
+                    Decimal(price_cents).scaleb(-2), None, is_group_gift,
+                    Decimal(funded_cents).scaleb(-2), len(amounts), owner_id, item_created, None,
+                ))
+                changes += 1 + len(amounts)
+                last_change = max(last_change, item_created)
+
+            title = f"{self.rng.choice(OCCASIONS)} {'(viral) ' if viral else ''}wishlist"
+            wishlists.append((wishlist_id, f"load{seed}-{n}", title, None, owner_id, 1 + changes,
+                              created_at, last_change if changes else None))
+        return wishlists, items, reservations, contributions
+
+    # Friendships
+
+    def friendship_records(self, start: int, stop: int):
+        """Friendships requested by users start..stop-1.
+
+        User n befriends n + offset (mod users) for distinct offsets below
+        users / 2, which makes every unordered pair unique without keeping
+        a set of pairs in memory.
+        """
+        max_offset = (self.users - 1) // 2
+        mean = self.args.friends_per_user / 2
+        for n in range(start, stop):
+            if max_offset < 1 or mean <= 0:
+                return
+            # Low user numbers start more friendships; the average stays at mean
+            popularity = (1 + FRIEND_SKEW * (1 - n / self.users)) / (1 + FRIEND_SKEW / 2)
+            count = min(int(self.rng.expovariate(1 / (mean * popularity))), max_offset)
+            for offset in self.rng.sample(range(1, max_offset + 1), count):
+                requester, addressee = self.user_id(n), self.user_id((n + offset) % self.users)
+                if self.rng.random() < 0.5:
+                    requester, addressee = addressee, requester
+                low, high = sorted((requester, addressee))
+                roll = self.rng.random()
+                status = "ACCEPTED" if roll < 0.7 else "PENDING" if roll < 0.9 else "REJECTED"
+                created_at = (BASE_TIME - timedelta(seconds=self.rng.randrange(YEAR_SECONDS))).replace(tzinfo=None)
+                yield (self.new_id(), requester, addressee, low, high, status, created_at, created_at)
+
+
+def chunks(total: int, size: int):
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+async def copy(pg, generator: Generator, table: str, columns: list, records: list):
+    if records:
+        await pg.copy_records_to_table(table, records=records, columns=columns)
+        generator.counts[table] += len(records)
+
+
+def progress(label: str, done: int, total: int, started: float):
+    elapsed = time.perf_counter() - started
+    print(f"   {label}: {done:,}/{total:,} ({elapsed:.1f}s)", end="\r", flush=True)
+
+
+async def generate(args):
+    generator = Generator(args)
+    total_wishlists = int(args.users * args.wishlists_per_user)
+    print(f"📋 Database: {settings.DATABASE_URL[:80]}...")
+    print(f"🌱 Seed {args.seed}: {args.users:,} users, {total_wishlists:,} wishlists")
+
+    password_hash = get_password_hash(PASSWORD)
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        # Plain asyncpg connection; every COPY commits on its own
+        pg = raw.driver_connection
+
+        if args.truncate:
+            await pg.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+            print("🗑️  Truncated application tables")
+
+        for start, stop in chunks(args.users, args.batch_size):
+            await copy(pg, generator, "users", USER_COLUMNS,
+                       list(generator.user_records(start, stop, password_hash)))
+            progress("users", stop, args.users, started)
+        print()
+
+        for start, stop in chunks(total_wishlists, max(args.batch_size // 20, 1)):
+            wishlists, items, reservations, contributions = generator.wishlist_records(start, stop)
+            await copy(pg, generator, "wishlists", WISHLIST_COLUMNS, wishlists)
+            await copy(pg, generator, "items", ITEM_COLUMNS, items)
+            await copy(pg, generator, "reservations", RESERVATION_COLUMNS, reservations)
+            await copy(pg, generator, "contributions", CONTRIBUTION_COLUMNS, contributions)
+            progress("wishlists", stop, total_wishlists, started)
+        print()
+
+        for start, stop in chunks(args.users, max(args.batch_size // 10, 1)):
+            await copy(pg, generator, "friendships", FRIENDSHIP_COLUMNS,
+                       list(generator.friendship_records(start, stop)))
+            progress("friendship requesters", stop, args.users, started)
+        print()
+
+        print("📈 Analyzing tables ...")
+        for table in reversed(TABLES):
+            await pg.execute(f"ANALYZE {table}")
+
+    await engine.dispose()
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Generated in {elapsed:.1f}s:")
+    for table in reversed(TABLES):
+        count = generator.counts[table]
+        print(f"   {table:<14} {count:>12,} ({count / elapsed:,.0f} rows/s)")
+    print(f"\n   Log in as load{args.seed}-0@example.com / {PASSWORD} (the busiest user)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000, help="number of users")
+    parser.add_argument("--wishlists-per-user", type=float, default=2.0, help="average wishlists per user")
+    parser.add_argument("--items-per-wishlist", type=int, default=10, help="average items per wishlist")
+    parser.add_argument("--contributions-per-gift", type=float, default=3.0,
+                        help="average contributions per group gift item (ten times more on viral lists)")
+    parser.add_argument("--friends-per-user", type=float, default=10.0, help="average friendships per user")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; same seed and sizes give the same data")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="users per COPY batch")
+    parser.add_argument("--truncate", action="store_true", help="empty the application tables first")
+    args = parser.parse_args()
+    asyncio.run(generate(args))
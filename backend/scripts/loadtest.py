@@ -0,0 +1,306 @@
+"""
+Load-test the public wishlist and contribution flows of a running app.
+
+Models the real traffic mix against --base-url:
+
+- viewers open /ws/{slug} like the public wishlist page, fetch
+  GET /api/wishlists/{slug} once and refetch it (with If-None-Match and the
+  event's version as min_version, like a browser) on every wishlist_updated
+  event
+- contributors POST /api/items/{id}/contribute with small guest amounts
+- reservers POST /api/items/{id}/reserve on regular items
+
+Target wishlists come from --slugs, or else the busiest wishlists (highest
+version) are read from DATABASE_URL, e.g. after scripts.generate_load_data.
+Viewers are spread over them with a bias towards the first (busiest) one.
+
+Reports throughput, p50/p95/p99 latency and error rate per endpoint, plus
+broadcast fan-out delay (from the server's sent_at to receipt) and the
+delay until the refetch after an event has completed. The fan-out numbers
+assume client and server share a clock, i.e. run on the same machine.
+Expected refusals (409 already reserved, 400 over the remaining amount,
+304 not modified) are counted by status but not as errors. The full
+result is written as JSON, tagged with the current git commit, so runs
+can be compared across commits.
+
+Usage (from the backend directory, with the app running):
+    python -m scripts.loadtest [--viewers 2000] [--contributors 50] [--reservers 10] [--duration 60]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+import httpx
+from websockets.asyncio.client import connect
+
+GET_WISHLIST = "GET /api/wishlists/{slug}"
+CONTRIBUTE = "POST /api/items/{id}/contribute"
+RESERVE = "POST /api/items/{id}/reserve"
+
+# Statuses that are part of normal traffic rather than failures
+EXPECTED_STATUSES = {
+    GET_WISHLIST: {200, 304},
+    CONTRIBUTE: {201, 400},
+    RESERVE: {201, 400, 409},
+}
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latency_summary(values: list) -> dict:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 2),
+        "p95_ms": round(percentile(values, 0.95), 2),
+        "p99_ms": round(percentile(values, 0.99), 2),
+        "max_ms": round(max(values), 2),
+    }
+
+
+class Recorder:
+    """Latencies, statuses and errors per endpoint, plus WebSocket counters."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = defaultdict(Counter)
+        self.ws_connected = 0
+        self.ws_failed = Counter()
+        self.ws_messages = Counter()
+        self.fanout_delays = []
+        self.refetch_delays = []
+
+    async def request(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[endpoint][type(e).__name__] += 1
+            return None
+        self.latencies[endpoint].append((time.perf_counter() - started) * 1000)
+        self.statuses[endpoint][response.status_code] += 1
+        if response.status_code not in EXPECTED_STATUSES[endpoint]:
+            self.errors[endpoint][f"HTTP {response.status_code}"] += 1
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint in EXPECTED_STATUSES:
+            requests = sum(self.statuses[endpoint].values()) + sum(
+                count for error, count in self.errors[endpoint].items() if not error.startswith("HTTP ")
+            )
+            errors = sum(self.errors[endpoint].values())
+            endpoints[endpoint] = {
+                "requests": requests,
+                "throughput_rps": round(requests / elapsed, 2),
+                "latency": latency_summary(self.latencies[endpoint]),
+                "statuses": {str(code): count for code, count in sorted(self.statuses[endpoint].items())},
+                "errors": dict(self.errors[endpoint]),
+                "error_rate": round(errors / requests, 4) if requests else 0.0,
+            }
+        return {
+            "endpoints": endpoints,
+            "websocket": {
+                "connected": self.ws_connected,
+                "failed": dict(self.ws_failed),
+                "messages": dict(self.ws_messages),
+                "fanout_delay": latency_summary(self.fanout_delays),
+                "refetch_after_event": latency_summary(self.refetch_delays),
+            },
+        }
+
+
+async def load_targets(client: httpx.AsyncClient, slugs: list) -> list:
+    """Public view of every target wishlist, for its item ids."""
+    targets = []
+    for slug in slugs:
+        response = await client.get(f"/api/wishlists/{slug}")
+        response.raise_for_status()
+        items = response.json()["items"]
+        targets.append({
+            "slug": slug,
+            "group_gifts": [item["id"] for item in items if item["is_group_gift"]],
+            "regular": [item["id"] for item in items if not item["is_group_gift"] and not item.get("reserved_by")],
+        })
+    return targets
+
+
+async def busiest_slugs(count: int) -> list:
+    from sqlalchemy import select
+    from app.db.base import engine
+    from app.db.models import Wishlist
+
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(Wishlist.slug)
+            .where(Wishlist.deleted_at.is_(None))
+            .order_by(Wishlist.version.desc())
+            .limit(count)
+        )
+        slugs = list(result.scalars())
+    await engine.dispose()
+    return slugs
+
+
+def pick(rng: random.Random, targets: list) -> dict:
+    """Target biased towards the first ones, which are the busiest."""
+    return targets[int(len(targets) * rng.random() ** 2)]
+
+
+async def viewer(client, ws_url: str, target: dict, recorder: Recorder, start_delay: float):
+    await asyncio.sleep(start_delay)
+    slug = target["slug"]
+    etag = None
+
+    async def refetch(min_version=None):
+        nonlocal etag
+        headers = {"If-None-Match": etag} if etag else {}
+        params = {"min_version": min_version} if min_version else {}
+        response = await recorder.request(client, GET_WISHLIST, "GET", f"/api/wishlists/{slug}",
+                                          headers=headers, params=params)
+        if response is not None and response.status_code == 200:
+            etag = response.headers.get("etag")
+
+    try:
+        async with connect(f"{ws_url}/ws/{slug}", open_timeout=30) as websocket:
+            recorder.ws_connected += 1
+            await refetch()
+            async for raw in websocket:
+                received = time.time()
+                message = json.loads(raw)
+                recorder.ws_messages[message.get("type", "unknown")] += 1
+                sent_at = message.get("sent_at")
+                if sent_at is not None:
+                    recorder.fanout_delays.append((received - sent_at) * 1000)
+                if message.get("type") == "wishlist_updated":
+                    await refetch(message.get("version"))
+                    if sent_at is not None:
+                        recorder.refetch_delays.append((time.time() - sent_at) * 1000)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        recorder.ws_failed[type(e).__name__] += 1
+
+
+async def contributor(client, rng: random.Random, targets: list, recorder: Recorder, think_time: float, n: int):
+    while True:
+        target = pick(rng, targets)
+        if target["group_gifts"]:
+            item_id = rng.choice(target["group_gifts"])
+            amount = f"{rng.randint(1, 100) / 100:.2f}"
+            await recorder.request(client, CONTRIBUTE, "POST", f"/api/items/{item_id}/contribute",
+                                   json={"amount": amount, "guest_name": f"Load contributor {n}"})
+        await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+async def reserver(client, rng: random.Random, targets: list, recorder: Recorder, think_time: float, n: int):
+    while True:
+        target = pick(rng, targets)
+        if target["regular"]:
+            item_id = rng.choice(target["regular"])
+            await recorder.request(client, RESERVE, "POST", f"/api/items/{item_id}/reserve",
+                                   json={"guest_name": f"Load reserver {n}"})
+        await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    ws_url = args.base_url.replace("http://", "ws://").replace("https://", "wss://")
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        slugs = args.slugs or await busiest_slugs(args.wishlists)
+        if not slugs:
+            raise SystemExit("❌ No target wishlists; pass --slugs or run scripts.generate_load_data first")
+        targets = await load_targets(client, slugs)
+        print(f"🎯 {len(targets)} target wishlists, busiest: {targets[0]['slug']} "
+              f"({len(targets[0]['group_gifts'])} group gifts, {len(targets[0]['regular'])} unreserved items)")
+
+        recorder = Recorder()
+        tasks = [
+            asyncio.create_task(viewer(client, ws_url, pick(rng, targets), recorder, args.ramp * i / max(args.viewers, 1)))
+            for i in range(args.viewers)
+        ]
+        tasks += [
+            asyncio.create_task(contributor(client, random.Random(rng.random()), targets, recorder, args.think_time, n))
+            for n in range(args.contributors)
+        ]
+        tasks += [
+            asyncio.create_task(reserver(client, random.Random(rng.random()), targets, recorder, args.think_time, n))
+            for n in range(args.reservers)
+        ]
+
+        print(f"🚀 {args.viewers} viewers (ramp {args.ramp:.0f}s), {args.contributors} contributors, "
+              f"{args.reservers} reservers for {args.duration:.0f}s ...")
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        elapsed = time.perf_counter() - started
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    result = {
+        "started_at": started_at.isoformat(),
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "duration_seconds": round(elapsed, 2),
+        **recorder.report(elapsed),
+    }
+
+    print(f"\n📊 {elapsed:.0f}s against {args.base_url}:")
+    print(f"   {'endpoint':<34} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for endpoint, stats in result["endpoints"].items():
+        latency = stats["latency"]
+        if not latency["count"]:
+            print(f"   {endpoint:<34} {'-':>8}")
+            continue
+        print(f"   {endpoint:<34} {stats['throughput_rps']:>8.1f} {latency['p50_ms']:>7.1f}ms "
+              f"{latency['p95_ms']:>7.1f}ms {latency['p99_ms']:>7.1f}ms {stats['error_rate']:>6.1%}")
+    websocket = result["websocket"]
+    print(f"\n   websockets: {websocket['connected']} connected, failed {websocket['failed'] or 0}, "
+          f"messages {websocket['messages']}")
+    for label, key in (("fan-out delay", "fanout_delay"), ("refetch after event", "refetch_after_event")):
+        stats = websocket[key]
+        if stats["count"]:
+            print(f"   {label:<20} p50 {stats['p50_ms']:.1f}ms  p95 {stats['p95_ms']:.1f}ms  p99 {stats['p99_ms']:.1f}ms")
+
+    output = args.output or f"loadtest-{started_at:%Y%m%d-%H%M%S}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000", help="running app to test")
+    parser.add_argument("--slugs", nargs="*", help="target wishlist slugs (default: busiest from the database)")
+    parser.add_argument("--wishlists", type=int, default=20, help="number of busiest wishlists to target")
+    parser.add_argument("--viewers", type=int, default=2000, help="WebSocket viewers")
+    parser.add_argument("--contributors", type=int, default=50, help="concurrent contributors")
+    parser.add_argument("--reservers", type=int, default=10, help="concurrent reservers")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between a writer's requests")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run after starting")
+    parser.add_argument("--ramp", type=float, default=10, help="seconds over which viewers connect")
+    parser.add_argument("--max-connections", type=int, default=500, help="HTTP connection pool size")
+    parser.add_argument("--timeout", type=float, default=30, help="HTTP timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for target and item choices")
+    parser.add_argument("--output", help="JSON result file (default: loadtest-<timestamp>.json)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
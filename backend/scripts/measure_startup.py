@@ -0,0 +1,61 @@
+"""
+Measure cold-start time of the app for each DB_SCHEMA_MODE.
+
+Every run is a fresh Python process, like a new worker: it times importing
+app.main and then running the startup hook against DATABASE_URL. Prints
+the median and max of both for `create` (create_all plus the ALTER TABLEs
+on every boot) and `check` (compare the Alembic revision only).
+
+Run `alembic upgrade head` first so `check` sees a migrated database.
+
+Usage (from the backend directory):
+    python -m scripts.measure_startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import asyncio, contextlib, io, json, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    async def boot():
+        await main.startup()
+        await main.engine.dispose()
+    asyncio.run(boot())
+booted = time.perf_counter()
+print(json.dumps({"import": imported - started, "startup": booted - imported}))
+"""
+
+
+def run_once(mode: str) -> dict:
+    env = dict(os.environ, DB_SCHEMA_MODE=mode)
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int):
+    print(f"\n⏱️  Cold start over {runs} fresh processes per mode:")
+    print(f"   {'mode':<8} {'import p50':>11} {'startup p50':>12} {'startup max':>12} {'total p50':>10}")
+    for mode in ("create", "check"):
+        samples = [run_once(mode) for _ in range(runs)]
+        imports = [s["import"] * 1000 for s in samples]
+        startups = [s["startup"] * 1000 for s in samples]
+        totals = [i + s for i, s in zip(imports, startups)]
+        print(f"   {mode:<8} {statistics.median(imports):>9.0f}ms {statistics.median(startups):>10.0f}ms "
+              f"{max(startups):>10.0f}ms {statistics.median(totals):>8.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode")
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,35 @@
+"""
+Finish purging soft-deleted wishlists.
+
+Large wishlists are hidden with deleted_at and purged by a background task
+after the delete request. If the process restarts before that task is
+done, the rows stay behind; this script deletes them in the same batches.
+Safe to run at any time, for example from cron.
+
+Usage (from the backend directory):
+    python -m scripts.purge_deleted_wishlists
+"""
+import asyncio
+import time
+from app.db.base import engine
+from app.services.wishlist_purge import purge_wishlist, soft_deleted_wishlist_ids
+
+
+async def main():
+    wishlist_ids = await soft_deleted_wishlist_ids()
+    if not wishlist_ids:
+        print("✅ No soft-deleted wishlists left to purge")
+        await engine.dispose()
+        return
+
+    print(f"🧹 Purging {len(wishlist_ids)} soft-deleted wishlists ...")
+    for wishlist_id in wishlist_ids:
+        started = time.perf_counter()
+        purged = await purge_wishlist(wishlist_id)
+        print(f"   {wishlist_id}: {purged} items in {time.perf_counter() - started:.2f}s")
+    print("✅ Done")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Script to find and repair drift between item funding totals and contributions.
+
+Compares items.funded_amount / items.contribution_count with the sum and count
+of their contribution rows. Without --fix it only reports drift; with --fix it
+recomputes each drifted item under a row lock, so it is also the backfill for
+databases created before the running totals existed.
+
+Usage (from the backend directory):
+    python -m scripts.reconcile_funding_totals [--fix]
+"""
+import argparse
+import asyncio
+from sqlalchemy import text
+from app.db.base import engine
+from app.core.config import settings
+
+DRIFT_QUERY = text("""
+    SELECT i.id, i.funded_amount, i.contribution_count,
+           COALESCE(c.total, 0) AS actual_total, COALESCE(c.cnt, 0) AS actual_count
+    FROM items i
+    LEFT JOIN (
+        SELECT item_id, SUM(amount) AS total, COUNT(*) AS cnt
+        FROM contributions
+        GROUP BY item_id
+    ) c ON c.item_id = i.id
+    WHERE i.funded_amount <> COALESCE(c.total, 0)
+       OR i.contribution_count <> COALESCE(c.cnt, 0)
+""")
+
+FIX_ITEM = text("""
+    UPDATE items
+    SET funded_amount = totals.total,
+        contribution_count = totals.cnt
+    FROM (
+        SELECT COALESCE(SUM(amount), 0) AS total, COUNT(*) AS cnt
+        FROM contributions
+        WHERE item_id = :item_id
+    ) AS totals
+    WHERE items.id = :item_id
+""")
+
+
+async def reconcile_funding_totals(fix: bool):
+    """Report items whose running totals differ from their contributions."""
+    print(f"📋 Database: {settings.DATABASE_URL[:80]}...")
+
+    async with engine.connect() as conn:
+        drifted = (await conn.execute(DRIFT_QUERY)).all()
+
+    if not drifted:
+        print("✅ No drift found")
+        return
+
+    print(f"\n⚠️  {len(drifted)} item(s) with drift:")
+    for item_id, funded_amount, contribution_count, actual_total, actual_count in drifted:
+        print(f"   {item_id}: stored {funded_amount} / {contribution_count}, actual {actual_total} / {actual_count}")
+
+    if not fix:
+        print("\n💡 Run with --fix to repair them.")
+        return
+
+    for item_id, *_ in drifted:
+        # Lock the item so the recompute can't race the conditional UPDATE in
+        # insert_contribution, which would wait on this lock and then re-check
+        # its guard against the repaired total
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT id FROM items WHERE id = :item_id FOR UPDATE"), {"item_id": item_id})
+            await conn.execute(FIX_ITEM, {"item_id": item_id})
+    print(f"\n✅ Repaired {len(drifted)} item(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="recompute drifted items")
+    args = parser.parse_args()
+    asyncio.run(reconcile_funding_totals(args.fix))
@@ -11,7 +11,7 @@ interface ContributionModalProps {
   isOpen: boolean;
   onClose: () => void;
   item: Item;
-  onSuccess: () => void;
+  onSuccess: (version?: number) => void;
   isAuthenticated: boolean;
 }
 
@@ -62,7 +62,7 @@ export const ContributionModal: React.FC<ContributionModalProps> = ({
 
     setIsLoading(true);
     try {
-      await api.post(`/items/${item.id}/contribute`, {
+      const response = await api.post(`/items/${item.id}/contribute`, {
         guest_name: isAuthenticated ? null : name.trim(),
         amount: amountNum,
       });
@@ -71,7 +71,8 @@ export const ContributionModal: React.FC<ContributionModalProps> = ({
         setGuestName(name.trim());
       }
 
-      onSuccess();
+      // Guests read their own change back by passing this version as min_version
+      onSuccess(Number(response.headers['x-wishlist-version']) || undefined);
       setAmount('');
       setName('');
       onClose();
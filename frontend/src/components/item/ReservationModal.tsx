@@ -11,7 +11,7 @@ interface ReservationModalProps {
   isOpen: boolean;
   onClose: () => void;
   item: Item;
-  onSuccess: () => void;
+  onSuccess: (version?: number) => void;
   isAuthenticated: boolean;
 }
 
@@ -47,7 +47,7 @@ export const ReservationModal: React.FC<ReservationModalProps> = ({
 
     setIsLoading(true);
     try {
-      await api.post(`/items/${item.id}/reserve`, {
+      const response = await api.post(`/items/${item.id}/reserve`, {
         guest_name: isAuthenticated ? null : name.trim(),
       });
 
@@ -55,7 +55,8 @@ export const ReservationModal: React.FC<ReservationModalProps> = ({
         setGuestName(name.trim());
       }
 
-      onSuccess();
+      // Guests read their own change back by passing this version as min_version
+      onSuccess(Number(response.headers['x-wishlist-version']) || undefined);
       setName('');
       onClose();
     } catch (err: any) {
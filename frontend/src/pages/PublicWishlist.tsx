@@ -34,9 +34,12 @@ export const PublicWishlist: React.FC = () => {
     };
   }, [slug]);
 
-  const fetchWishlist = async () => {
+  const fetchWishlist = async (minVersion?: number) => {
     try {
-      const response = await api.get(`/wishlists/${slug}`);
+      // min_version makes the server skip a read replica that lags behind the event
+      const response = await api.get(`/wishlists/${slug}`, {
+        params: minVersion ? { min_version: minVersion } : undefined,
+      });
       const data = response.data;
       
       // If user is owner, redirect to edit view
@@ -59,7 +62,7 @@ export const PublicWishlist: React.FC = () => {
     const manager = new WebSocketManager(slug);
     manager.connect((data) => {
       if (data.type === 'wishlist_updated') {
-        fetchWishlist();
+        fetchWishlist(data.version);
       }
     });
     wsManagerRef.current = manager;
@@ -73,12 +76,12 @@ export const PublicWishlist: React.FC = () => {
     setContributionModalItem(item);
   };
 
-  const handleReservationSuccess = () => {
-    fetchWishlist();
+  const handleReservationSuccess = (version?: number) => {
+    fetchWishlist(version);
   };
 
-  const handleContributionSuccess = () => {
-    fetchWishlist();
+  const handleContributionSuccess = (version?: number) => {
+    fetchWishlist(version);
   };
 
   if (isLoading) {